@@ -2,9 +2,19 @@
 Application Factory
 Creates and configures the Flask application
 """
+import logging
+import os
+
+# eventlet must patch the stdlib before anything creates a socket.
+# gunicorn's eventlet worker patches on its own; set EVENTLET_MONKEY=1
+# when serving eventlet mode any other way.
+if os.getenv("EVENTLET_MONKEY", "0") == "1":
+    import eventlet
+    eventlet.monkey_patch()
+
 from flask import Flask
 from app.config import get_config
-from app.extensions import db, socketio
+from app.extensions import db, socketio, SocketJSON
 import pytz
 
 
@@ -18,35 +28,48 @@ def create_app(config_name=None):
     # Load configuration
     if config_name:
         from app.config import config
-        app.config.from_object(config[config_name])
+        config_class = config[config_name]
     else:
-        app.config.from_object(get_config())
+        config_class = get_config()
+    app.config.from_object(config_class)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = dict(config_class.engine_options())
+    
+    # DEBUG logs only in debug mode; production stays at INFO
+    app.logger.setLevel(logging.DEBUG if app.debug else logging.INFO)
+    
+    # psycopg2 is a C driver that monkey_patch() can't reach; without this
+    # wait callback every query would block the hub (and every socket on it)
+    if app.config['SOCKETIO_ASYNC_MODE'] == 'eventlet':
+        from psycogreen.eventlet import patch_psycopg
+        patch_psycopg()
     
     # Initialize extensions
     db.init_app(app)
     socketio.init_app(
         app,
         cors_allowed_origins=app.config['SOCKETIO_CORS_ALLOWED_ORIGINS'],
-        async_mode=app.config['SOCKETIO_ASYNC_MODE']
+        async_mode=app.config['SOCKETIO_ASYNC_MODE'],
+        json=SocketJSON,
+        # Fan emits out across workers when Redis is available
+        message_queue=app.config['REDIS_URL']
     )
     
     # Add pytz to Jinja globals (for template compatibility)
     app.jinja_env.globals['pytz'] = pytz
     
-    # Register blueprints
-    from app.routes import auth_bp, admin_bp, student_bp
+    # Register blueprints (route modules are imported on registration)
+    from app.routes import LazyBlueprint
     
     # Auth routes (no prefix)
-    app.register_blueprint(auth_bp)
+    app.register_blueprint(LazyBlueprint('app.routes.auth:auth_bp'))
     
     # Admin routes (prefixed with /admin)
-    app.register_blueprint(admin_bp, url_prefix='/admin')
+    app.register_blueprint(LazyBlueprint('app.routes.admin:admin_bp'), url_prefix='/admin')
     
     # Student routes (FIXED: Add /student prefix)
-    app.register_blueprint(student_bp, url_prefix='/student')
+    app.register_blueprint(LazyBlueprint('app.routes.student:student_bp'), url_prefix='/student')
     
-    from app.routes.public import public_bp
-    app.register_blueprint(public_bp)
+    app.register_blueprint(LazyBlueprint('app.routes.public:public_bp'))
 
     
     # Register Socket.IO events
@@ -54,9 +77,25 @@ def create_app(config_name=None):
     with app.app_context():
         register_socket_events()
     
-    # Create database tables
-    with app.app_context():
-        db.create_all()
-        print('>>> Database tables created/verified')
+    # Schema creation is an explicit step: `flask init-db`
+    app.cli.command('init-db')(init_db_command)
     
-    return app
\ No newline at end of file
+    # Create database tables (opt-in, production runs migrations instead)
+    if app.config.get('AUTO_CREATE_ALL', False):
+        with app.app_context():
+            create_tables()
+    
+    return app
+
+
+def create_tables():
+    """Create any missing tables for every registered model"""
+    from app.models import load_all_models
+    load_all_models()
+    db.create_all()
+
+
+def init_db_command():
+    """Create database tables"""
+    create_tables()
+    print('>>> Database tables created/verified')
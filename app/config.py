@@ -5,6 +5,8 @@ Industry-safe version (no class-load crashes)
 """
 
 import os
+from functools import lru_cache
+from sqlalchemy.pool import NullPool
 
 
 class Config:
@@ -27,12 +29,41 @@ class Config:
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
-    SQLALCHEMY_ENGINE_OPTIONS = {
-        "pool_size": int(os.getenv("DB_POOL_SIZE", 10)),
-        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 20)),
-        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
-        "pool_pre_ping": True,
-    }
+    @classmethod
+    @lru_cache(maxsize=None)
+    def engine_options(cls):
+        """SQLAlchemy engine options (env parsed once per process)"""
+        options = {
+            # Recycle before typical load-balancer idle timeouts instead of
+            # paying a SELECT 1 on every checkout (pre-ping is opt-in)
+            "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 600)),
+            "pool_pre_ping": os.getenv("DB_PRE_PING", "false").lower() == "true",
+            # Multi-row INSERT ... VALUES for executemany()
+            "insertmanyvalues_page_size": 1000,
+        }
+
+        # DB_POOL=null: behind PgBouncer (pool_mode=transaction) let the
+        # pooler own connections and close ours when the session ends
+        if os.getenv("DB_POOL", "queue").lower() == "null":
+            options["poolclass"] = NullPool
+        else:
+            options["pool_size"] = int(os.getenv("DB_POOL_SIZE", 10))
+            options["max_overflow"] = int(os.getenv("DB_MAX_OVERFLOW", 20))
+
+        # psycopg2-only dialect options (other drivers reject them)
+        scheme = cls.SQLALCHEMY_DATABASE_URI.split("://", 1)[0]
+        if scheme in ("postgresql", "postgresql+psycopg2"):
+            options["executemany_mode"] = "values_plus_batch"
+            options["executemany_batch_page_size"] = 500
+            # TCP keepalives let the kernel detect dead connections
+            options["connect_args"] = {
+                "keepalives": 1,
+                "keepalives_idle": 30,
+                "keepalives_interval": 10,
+                "keepalives_count": 5,
+            }
+
+        return options
 
     # ================= SESSION =================
     SESSION_COOKIE_SAMESITE = "Lax"
@@ -42,17 +73,28 @@ class Config:
     ).lower() == "true"
 
     # ================= SOCKET.IO =================
-    SOCKETIO_ASYNC_MODE = "threading"
+    # eventlet serves many sockets per worker via green threads;
+    # "threading" is the fallback for local dev without eventlet
+    SOCKETIO_ASYNC_MODE = os.getenv("SOCKETIO_ASYNC_MODE", "eventlet")
     SOCKETIO_CORS_ALLOWED_ORIGINS = "*"
 
+    # ================= REDIS =================
+    # Shared live quiz state + Socket.IO message queue (optional)
+    REDIS_URL = os.getenv("REDIS_URL")
+
     # ================= APP =================
     TIMEZONE = "Asia/Kolkata"
 
+    # Run db.create_all() on every app start (dev convenience only,
+    # otherwise use `flask init-db`)
+    AUTO_CREATE_ALL = os.getenv("AUTO_CREATE_ALL", "False").lower() == "true"
+
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     SESSION_COOKIE_SECURE = False
+    SOCKETIO_ASYNC_MODE = os.getenv("SOCKETIO_ASYNC_MODE", "threading")
 
 
 class ProductionConfig(Config):
@@ -70,6 +112,7 @@ config = {
 }
 
 
+@lru_cache(maxsize=1)
 def get_config():
     """Return config class based on FLASK_ENV"""
     env = os.getenv("FLASK_ENV", "development").lower()
@@ -2,6 +2,9 @@
 Flask Extensions
 Centralized extension initialization
 """
+import json
+import os
+from cachetools import TTLCache
 from flask_sqlalchemy import SQLAlchemy
 from flask_socketio import SocketIO
 
@@ -9,6 +12,60 @@ from flask_socketio import SocketIO
 db = SQLAlchemy()
 socketio = SocketIO()
 
-# Global state dictionaries (will be managed by services)
-quiz_state = {}
-active_participants = {}
\ No newline at end of file
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class SocketJSON:
+    """
+    json module replacement for Socket.IO packets
+    Uses orjson when installed, stdlib json otherwise
+    """
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        if orjson is None:
+            return json.dumps(obj, *args, **kwargs)
+        # orjson output is already compact, so separators= etc. are ignored
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        if orjson is None:
+            return json.loads(s, *args, **kwargs)
+        return orjson.loads(s)
+
+
+# Per-worker live state (managed by services), bounded and expiring so
+# finished quizzes don't pile up. With REDIS_URL set, Redis is the
+# shared source of truth instead.
+QUIZ_STATE_TTL = int(os.getenv("QUIZ_STATE_TTL", 6 * 3600))
+
+# Shared by every greenlet in the worker; callers wait for a free connection
+# instead of opening an unbounded number of sockets during a join storm
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+quiz_state = TTLCache(maxsize=1024, ttl=QUIZ_STATE_TTL)
+waiting_rooms = TTLCache(maxsize=1024, ttl=QUIZ_STATE_TTL)
+active_participants = TTLCache(maxsize=1024, ttl=QUIZ_STATE_TTL)
+# quiz_id -> Counter of sockets per username (distinct names without a rebuild)
+participant_name_counts = TTLCache(maxsize=1024, ttl=QUIZ_STATE_TTL)
+# sid -> (quiz_id, username), so a disconnect is a single lookup
+participant_sockets = TTLCache(maxsize=65536, ttl=QUIZ_STATE_TTL)
+
+
+def __getattr__(name):
+    # redis_client is created on first use (None when REDIS_URL is unset)
+    if name != 'redis_client':
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    client = None
+    url = os.getenv("REDIS_URL")
+    if url:
+        import redis
+        pool = redis.BlockingConnectionPool.from_url(
+            url, max_connections=REDIS_MAX_CONNECTIONS, decode_responses=True
+        )
+        client = redis.Redis(connection_pool=pool)
+    globals()['redis_client'] = client
+    return client
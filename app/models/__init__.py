@@ -1,11 +1,39 @@
 """
 Models Package
 Exports all database models
+Models are imported on first attribute access (PEP 562)
 """
-from app.models.user import User
-from app.models.quiz import Quiz
-from app.models.question import Question
-from app.models.answer import PartialAnswer
-from app.models.result import Result
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ['User', 'Quiz', 'Question', 'PartialAnswer', 'Result']
\ No newline at end of file
+if TYPE_CHECKING:
+    from app.models.user import User
+    from app.models.quiz import Quiz
+    from app.models.question import Question
+    from app.models.answer import PartialAnswer
+    from app.models.result import Result
+
+_LAZY = {
+    'User': ('app.models.user', 'User'),
+    'Quiz': ('app.models.quiz', 'Quiz'),
+    'Question': ('app.models.question', 'Question'),
+    'PartialAnswer': ('app.models.answer', 'PartialAnswer'),
+    'Result': ('app.models.result', 'Result'),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY[name]
+    value = getattr(importlib.import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+def load_all_models():
+    """Import every model so db.metadata knows all tables"""
+    return [__getattr__(name) for name in _LAZY]
+
+
+__all__ = ['User', 'Quiz', 'Question', 'PartialAnswer', 'Result']
@@ -2,12 +2,10 @@
 PartialAnswer Model
 Stores individual question answers
 """
+from sqlalchemy.dialects import postgresql, sqlite
 from app.extensions import db
-from datetime import datetime, timezone
 
-
-def now_utc():
-    return datetime.now(timezone.utc)
+_DIALECT_INSERT = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
 
 
 class PartialAnswer(db.Model):
@@ -15,20 +13,52 @@ class PartialAnswer(db.Model):
     __tablename__ = 'partial_answer'
     
     id = db.Column(db.Integer, primary_key=True)
-    quiz_id = db.Column(db.Integer, nullable=False, index=True)
+    quiz_id = db.Column(db.Integer, nullable=False)
     question_id = db.Column(db.Integer, nullable=False, index=True)
-    student = db.Column(db.String(100), nullable=False, index=True)
+    student = db.Column(db.String(100), nullable=False)
     is_correct = db.Column(db.Boolean, nullable=False)
     time_taken = db.Column(db.Integer, nullable=False, default=0)
     points = db.Column(db.Integer, default=0)
-    submitted_at = db.Column(db.DateTime, default=now_utc)
+    submitted_at = db.Column(db.DateTime(timezone=True), server_default=db.func.now(), index=True)  # age-based cleanup
     
     __table_args__ = (
         db.UniqueConstraint(
             'quiz_id', 'question_id', 'student',
             name='unique_answer_per_question'
         ),
+        # Student-scoped reads (scoring, my-stats, leaderboard aggregate);
+        # INCLUDE lets PostgreSQL answer them with an index-only scan
+        db.Index(
+            'ix_partial_answer_quiz_student_totals',
+            'quiz_id', 'student', 'question_id',
+            postgresql_include=['is_correct', 'points', 'time_taken']
+        ),
+        # Question-scoped reads (analytics, rank bonuses, per-question
+        # leaderboard): stored in leaderboard order, correct first then fastest
+        db.Index(
+            'ix_partial_answer_quiz_question_rank',
+            quiz_id, question_id, is_correct.desc(), time_taken
+        ),
     )
     
+    # submitted_at is stamped by the server; don't SELECT it back after each INSERT
+    __mapper_args__ = {'eager_defaults': False}
+    
     def __repr__(self):
-        return f'<PartialAnswer Q{self.question_id} by {self.student}>'
\ No newline at end of file
+        return f'<PartialAnswer Q{self.question_id} by {self.student}>'
+    
+    @classmethod
+    def upsert(cls, quiz_id, question_id, student, **values):
+        """
+        Insert a student's answer, replacing any earlier one for the question
+        One INSERT ... ON CONFLICT DO UPDATE on unique_answer_per_question
+        """
+        insert = _DIALECT_INSERT[db.session.get_bind().dialect.name]
+        stmt = insert(cls).values(
+            quiz_id=quiz_id, question_id=question_id, student=student, **values
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['quiz_id', 'question_id', 'student'],
+            set_={**values, 'submitted_at': db.func.now()}
+        )
+        db.session.execute(stmt)
\ No newline at end of file
@@ -2,12 +2,30 @@
 Question Model
 ENHANCED: Added new fields for advanced question types
 """
+from functools import cached_property
 from app.extensions import db
-import json
+from app.utils.helpers import html_to_text, strip_html_tags
+from sqlalchemy import bindparam, event, func, select
+from sqlalchemy.dialects import postgresql
+
+# JSONB on PostgreSQL (decoded by the driver), plain JSON elsewhere (SQLite)
+JSONType = postgresql.JSONB().with_variant(db.JSON(), 'sqlite')
+
+
+def _option_text(options: list[dict] | None, index: int) -> str:
+    """Text of the option at index, '' when there is none"""
+    if options and index < len(options):
+        return options[index].get('text') or ''
+    return ''
+
 
 class Question(db.Model):
     """Question model"""
     __tablename__ = 'question'
+    __table_args__ = (
+        # Per-quiz question lists are always read in display order
+        db.Index('ix_question_quiz_order', 'quiz_id', 'order'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     quiz_id = db.Column(db.Integer, db.ForeignKey('quiz.id'), nullable=False)
@@ -21,10 +39,10 @@ class Question(db.Model):
     question_type = db.Column(db.String(50), default='multiple-choice')
     
     # Options (for multiple-choice and checkbox)
-    options = db.Column(db.Text)  # Store as JSON string
+    options = db.Column(JSONType)  # List of {text, image, order}
     
     # Correct answers (supports multiple correct for checkboxes)
-    correct_answers = db.Column(db.Text)  # JSON string
+    correct_answers = db.Column(JSONType)  # List of option orders / texts
     
     # Scoring
     points = db.Column(db.Float, default=1.0)
@@ -36,44 +54,72 @@ class Question(db.Model):
     # Image in question
     question_image = db.Column(db.Text)  # Base64 or URL
     
-    # For backward compatibility
-    option1 = db.Column(db.String(200))
-    option2 = db.Column(db.String(200))
-    option3 = db.Column(db.String(200))
-    option4 = db.Column(db.String(200))
-    answer = db.Column(db.String(200))
-    
     def __repr__(self):
         return f'<Question {self.id}: {self.question[:50]}...>'
     
-    def get_options_with_images(self):
+    @classmethod
+    def count_for_quiz(cls, quiz_id) -> int:
+        """Number of questions in a quiz (Core statement, no Query object)"""
+        return db.session.execute(_COUNT_FOR_QUIZ, {'quiz_id': quiz_id}).scalar()
+    
+    def get_options_with_images(self) -> list[dict]:
         """Get options with images"""
-        if self.options:
-            try:
-                return json.loads(self.options)
-            except:
-                pass
-        
-        # Fallback for old data
-        options = []
-        for i, opt in enumerate([self.option1, self.option2, self.option3, self.option4], 1):
-            if opt:
-                options.append({
-                    'text': opt,
-                    'image': None,
-                    'order': i
-                })
-        return options
-    
-    def get_correct_answers(self):
+        return self.options or []
+    
+    def get_correct_answers(self) -> list:
         """Get correct answers as list"""
-        if self.correct_answers:
-            try:
-                return json.loads(self.correct_answers)
-            except:
-                pass
-        
-        # Fallback for old data
-        if self.answer:
-            return [self.answer]
-        return []
\ No newline at end of file
+        return self.correct_answers or []
+    
+    # Normalized answer sets for grading, built once per loaded instance
+    # (instances live for one request, so edits are picked up next request)
+    @cached_property
+    def correct_answer_set(self) -> frozenset[str]:
+        """Correct answers as strings (checkbox: exact set match)"""
+        return frozenset(str(ans) for ans in self.get_correct_answers())
+    
+    @cached_property
+    def correct_choice_set(self) -> frozenset[str]:
+        """Correct answers, whitespace-trimmed (multiple-choice)"""
+        return frozenset(str(ans).strip() for ans in self.get_correct_answers())
+    
+    @cached_property
+    def correct_text_set(self) -> frozenset[str]:
+        """Correct answers as plain lowercase text (short-answer/paragraph)"""
+        return frozenset(
+            strip_html_tags(str(ans)).strip().lower() for ans in self.get_correct_answers()
+        )
+    
+    # Read-only views of the old option1..option4 / answer columns (dropped,
+    # backfilled into options / correct_answers by migrate_db.py)
+    @property
+    def option1(self) -> str:
+        return _option_text(self.options, 0)
+    
+    @property
+    def option2(self) -> str:
+        return _option_text(self.options, 1)
+    
+    @property
+    def option3(self) -> str:
+        return _option_text(self.options, 2)
+    
+    @property
+    def option4(self) -> str:
+        return _option_text(self.options, 3)
+    
+    @property
+    def answer(self) -> str:
+        return str(self.correct_answers[0]) if self.correct_answers else ''
+
+
+@event.listens_for(Question, 'before_insert')
+@event.listens_for(Question, 'before_update')
+def _set_question_text_plain(mapper, connection, target):
+    """Keep question_text_plain in sync with the HTML on every write"""
+    target.question_text_plain = html_to_text(target.question)
+
+
+# Built once; only the bound quiz_id changes per call
+_COUNT_FOR_QUIZ = select(func.count(Question.id)).where(
+    Question.quiz_id == bindparam('quiz_id')
+)
@@ -2,12 +2,9 @@
 Quiz Model
 ENHANCED: Added overall timer and global leaderboard settings with NULL defaults
 """
+from sqlalchemy.ext.hybrid import hybrid_property
 from app.extensions import db
-from datetime import datetime, timezone
-
-
-def now_utc():
-    return datetime.now(timezone.utc)
+from app.models import question  # noqa: F401 - registers Question for the relationship below
 
 
 class Quiz(db.Model):
@@ -34,9 +31,18 @@ class Quiz(db.Model):
     is_paused = db.Column(db.Boolean, default=False)
     paused_at = db.Column(db.DateTime)
     paused_seconds = db.Column(db.Integer, default=0)
+    # Bumped whenever the question set changes (keys the graded-question cache)
+    content_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    __table_args__ = (
+        # Codes are matched as code.upper(); keep stored codes uppercase so
+        # that equality lookup always hits the unique join_code index
+        db.CheckConstraint('join_code = upper(join_code)', name='ck_quiz_join_code_upper'),
+    )
     
     # Relationships
-    questions = db.relationship('Question', backref='quiz', lazy=True, order_by='Question.order')
+    # selectin: listing N quizzes loads all their questions in one IN (...) query
+    questions = db.relationship('Question', backref='quiz', lazy='selectin', order_by='Question.order')
     
     def __repr__(self):
         return f'<Quiz {self.title}>'
@@ -45,13 +51,18 @@ class Quiz(db.Model):
         """Get total quiz time in seconds - returns 0 if disabled"""
         return self.overall_timer * 60 if self.overall_timer else 0
     
+    @hybrid_property
+    def leaderboard_on(self):
+        """Global leaderboard enabled (NULL counts as disabled)"""
+        return bool(self.show_leaderboard_global)
+    
+    @leaderboard_on.expression
+    def leaderboard_on(cls):
+        return cls.show_leaderboard_global.is_(True)
+    
     def should_show_leaderboard(self, question=None):
         """
         Determine if leaderboard should be shown
         Returns False if global is None/False
         """
-        if not self.show_leaderboard_global:
-            return False
-        if question and hasattr(question, 'show_leaderboard'):
-            return question.show_leaderboard
-        return bool(self.show_leaderboard_global)
\ No newline at end of file
+        return self.leaderboard_on and (question.show_leaderboard if question else True)
\ No newline at end of file
@@ -18,5 +18,12 @@ class Result(db.Model):
     total_points = db.Column(db.Integer)
     submitted_at = db.Column(db.DateTime)
     
+    __table_args__ = (
+        # Final leaderboard: a quiz's results, highest points first
+        db.Index('ix_result_quiz_points', quiz_id, total_points.desc()),
+        # Student history: newest first
+        db.Index('ix_result_student_submitted', student, submitted_at.desc()),
+    )
+    
     def __repr__(self):
         return f'<Result {self.student}: {self.score}/{self.total}>'
\ No newline at end of file
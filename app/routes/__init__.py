@@ -1,9 +1,47 @@
 """
 Routes Package
 Exports all route blueprints
+Blueprints are imported on first access so loading one route module
+does not drag in the whole route graph
 """
-from app.routes.auth import auth_bp
-from app.routes.admin import admin_bp
-from app.routes.student import student_bp
+import importlib
 
-__all__ = ['auth_bp', 'admin_bp', 'student_bp']
\ No newline at end of file
+_BLUEPRINTS = {
+    'auth_bp': 'app.routes.auth',
+    'admin_bp': 'app.routes.admin',
+    'student_bp': 'app.routes.student',
+    'public_bp': 'app.routes.public',
+}
+
+
+class LazyBlueprint:
+    """
+    Blueprint placeholder resolved at registration time
+    Takes a "module:attribute" path, e.g. "app.routes.auth:auth_bp"
+    """
+
+    def __init__(self, import_path):
+        self.import_path = import_path
+        self.module_name, _, self.attr = import_path.partition(':')
+
+    def resolve(self):
+        """Import the target module and return the real blueprint"""
+        return getattr(importlib.import_module(self.module_name), self.attr)
+
+    def register(self, app, options):
+        """Called by app.register_blueprint() - delegate to the real blueprint"""
+        self.resolve().register(app, options)
+
+    def __repr__(self):
+        return f'<LazyBlueprint {self.import_path}>'
+
+
+def __getattr__(name):
+    if name not in _BLUEPRINTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_BLUEPRINTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = ['auth_bp', 'admin_bp', 'student_bp', 'public_bp', 'LazyBlueprint']
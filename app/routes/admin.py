@@ -4,31 +4,49 @@ All admin functionality: dashboard, quizzes, questions, live control, analytics
 ENHANCED: Added overall timer, leaderboard toggle, advanced question types
 FIXED: Quiz creation defaults, question collection using getlist('question[]')
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
-from app.extensions import db, socketio, quiz_state
-from app.models import User, Quiz, Question, PartialAnswer, Result
-from app.utils import require_admin, now_utc, utc_to_ist, generate_join_code
-from app.services import ScoringService, LeaderboardService
-from sqlalchemy import func
-import time
-import json
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, current_app
+from app.extensions import db, socketio
+from app.models import Quiz, Question, PartialAnswer, Result
+from app.utils import require_admin, now_utc, utc_to_ist, generate_join_code, html_to_text
+from app.services import ScoringService, LeaderboardService, QuizStateService, DashboardService, PublishedQuizService
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import noload
+from collections import defaultdict
 import re
+import time
 
 admin_bp = Blueprint('admin', __name__)
 
+# Dynamic add-question form fields: question_<i> and option<n>_<i>
+_QUESTION_KEY_RE = re.compile(r'question_(\d+)')
+_OPTION_KEY_RE = re.compile(r'option(\d+)_(\d+)')
+
+# Columns the live screens display; fetched as Row tuples, not entities
+_LIVE_QUESTION_COLUMNS = (
+    Question.id, Question.order, Question.question, Question.question_type,
+    Question.points, Question.show_leaderboard,
+    Question.options, Question.correct_answers,
+)
+
+
+def live_question_rows(quiz_id):
+    """Ordered question rows for the live control/leaderboard screens"""
+    return db.session.execute(
+        select(*_LIVE_QUESTION_COLUMNS)
+        .where(Question.quiz_id == quiz_id)
+        .order_by(Question.order)
+    ).all()
+
 
 def clear_quiz_session_data(quiz_id):
     """Clear all partial answers for a quiz session"""
-    print(f"\n{'='*60}")
-    print(f"CLEARING SESSION DATA FOR QUIZ {quiz_id}")
-    print(f"{'='*60}")
-    
-    partial_count = PartialAnswer.query.filter_by(quiz_id=quiz_id).count()
-    PartialAnswer.query.filter_by(quiz_id=quiz_id).delete()
+    # delete() returns the affected row count, no separate COUNT needed
+    partial_count = PartialAnswer.query.filter_by(quiz_id=quiz_id).delete()
     db.session.commit()
+    LeaderboardService.invalidate(quiz_id)
     
-    print(f"✓ Deleted {partial_count} partial answers")
-    print(f"{'='*60}\n")
+    current_app.logger.debug('Quiz %s: deleted %s partial answers', quiz_id, partial_count)
     
     return {
         'partial_answers_cleared': partial_count,
@@ -36,31 +54,34 @@ def clear_quiz_session_data(quiz_id):
     }
 
 
-def strip_html_tags(html_text):
-    """Strip HTML tags from text for plain text storage"""
-    if not html_text:
-        return ""
-    clean = re.compile('<.*?>')
-    return re.sub(clean, '', html_text)
+def assign_join_code(quiz, attempts=3):
+    """
+    Give a quiz a fresh join code
+    The unique join_code index is the collision check: a clash only rolls
+    back a savepoint and draws again, so there is no SELECT beforehand
+    """
+    # Keep the caller's pending changes out of the savepoint
+    db.session.flush()
+    for attempt in range(attempts):
+        try:
+            with db.session.begin_nested():
+                quiz.join_code = generate_join_code()
+            return
+        except IntegrityError:
+            if attempt == attempts - 1:
+                raise
+            current_app.logger.info('Quiz %s: join code collision, retrying', quiz.id)
 
 
 @admin_bp.route('/dashboard')
 @require_admin
 def dashboard():
     """Admin dashboard"""
-    total_quizzes = Quiz.query.count()
-    active_quizzes = Quiz.query.filter_by(is_active=True).count()
-    total_students = User.query.filter_by(role='student').count()
-    total_responses = Result.query.count()
-    recent_results = Result.query.order_by(Result.submitted_at.desc()).limit(5).all()
+    counters = DashboardService.get_counters()
     
     return render_template(
         'admin_dashboard.html',
-        total_quizzes=total_quizzes,
-        active_quizzes=active_quizzes,
-        total_students=total_students,
-        total_responses=total_responses,
-        recent_results=recent_results
+        **counters
     )
 
 
@@ -89,6 +110,7 @@ def quizzes():
         )
         db.session.add(quiz)
         db.session.commit()
+        DashboardService.invalidate()
         
         flash(
             f"{'Timer-based' if has_timer else 'Normal'} quiz created successfully! Now add questions.",
@@ -102,49 +124,56 @@ def quizzes():
 @admin_bp.route('/add-question/<int:quiz_id>', methods=['GET', 'POST'])
 @require_admin
 def add_question(quiz_id):
-    quiz = Quiz.query.get_or_404(quiz_id)
+    quiz = db.get_or_404(Quiz, quiz_id)
 
     if quiz.is_active:
         flash('Cannot add questions to an active quiz.', 'error')
         return redirect(url_for('admin.quizzes'))
 
     if request.method == 'POST':
+        # Plain dict: no multi-valued fields here, and dict.get skips MultiDict overhead
+        form = request.form.to_dict()
 
         # ================= QUIZ SETTINGS =================
-        enable_overall_timer = request.form.get('enable_overall_timer')
+        enable_overall_timer = form.get('enable_overall_timer')
         if enable_overall_timer == 'on':
             try:
-                hours = int(request.form.get('overall_timer_hours', 0))
-                minutes = int(request.form.get('overall_timer_minutes', 0))
+                hours = int(form.get('overall_timer_hours', 0))
+                minutes = int(form.get('overall_timer_minutes', 0))
                 total_minutes = (hours * 60) + minutes
                 quiz.overall_timer = total_minutes if total_minutes > 0 else None
-            except:
+            except (ValueError, TypeError):
                 quiz.overall_timer = None
         else:
             quiz.overall_timer = None
 
-        quiz.show_leaderboard_global = True if request.form.get('show_leaderboard_global') == 'on' else None
+        quiz.show_leaderboard_global = True if form.get('show_leaderboard_global') == 'on' else None
 
         # ================= DELETE OLD QUESTIONS =================
-        if request.form.get('overwrite') == '1':
-            Question.query.filter_by(quiz_id=quiz_id).delete()
-            db.session.commit()
-            print(f"✅ Deleted existing questions for quiz {quiz_id}")
+        # Same transaction as the insert below; rows aren't loaded just to delete them
+        if form.get('overwrite') == '1':
+            Question.query.filter_by(quiz_id=quiz_id).delete(synchronize_session=False)
+            current_app.logger.debug('Quiz %s: deleting existing questions', quiz_id)
 
-        added = False
+        rows = []
         question_count = 0
 
         # ================= READ DYNAMIC QUESTIONS =================
-        i = 0
-        while True:
-            qtext = request.form.get(f'question_{i}')
-            qtype = request.form.get(f'question_type_{i}')
-
-            if qtext is None:
-                break
+        # One pass over the form: question indices + option texts per question
+        question_indices = []
+        option_texts = defaultdict(dict)
+        for key in form:
+            if (match := _QUESTION_KEY_RE.fullmatch(key)):
+                question_indices.append(int(match.group(1)))
+            elif (match := _OPTION_KEY_RE.fullmatch(key)):
+                option_texts[int(match.group(2))][int(match.group(1))] = form[key]
+        question_indices.sort()
+
+        for i in question_indices:
+            qtext = form.get(f'question_{i}')
+            qtype = form.get(f'question_type_{i}')
 
             if not qtext.strip():
-                i += 1
                 continue
 
             question_count += 1
@@ -155,13 +184,15 @@ def add_question(quiz_id):
 
             # ================= OPTIONS =================
             if qtype in ['multiple-choice', 'checkbox']:
+                correct_val = form.get(f'answer_{i}') if qtype == 'multiple-choice' else None
+                texts = option_texts.get(i, {})
                 option_index = 1
                 while True:
-                    option_text = request.form.get(f'option{option_index}_{i}')
+                    option_text = texts.get(option_index)
                     if not option_text:
                         break
 
-                    option_image = request.form.get(f'option_image_{option_index}_{i}')
+                    option_image = form.get(f'option_image_{option_index}_{i}')
 
                     options.append({
                         "text": option_text,
@@ -171,17 +202,16 @@ def add_question(quiz_id):
 
                     # Correct Answer
                     if qtype == 'multiple-choice':
-                        correct_val = request.form.get(f'answer_{i}')
                         if correct_val and str(option_index) == str(correct_val):
                             correct_answers = [option_index]
                     else:
-                        if request.form.get(f'correct_{i}_{option_index}') == 'on':
+                        if form.get(f'correct_{i}_{option_index}') == 'on':
                             correct_answers.append(option_index)
 
                     option_index += 1
 
             else:
-                correct_text = request.form.get(f'correct_answer_{i}', '')
+                correct_text = form.get(f'correct_answer_{i}', '')
                 if correct_text:
                     correct_answers = [correct_text]
                     options = [{
@@ -192,54 +222,48 @@ def add_question(quiz_id):
 
             # ================= POINTS =================
             try:
-                points = float(request.form.get(f'points_{i}', 1))
-            except:
+                points = float(form.get(f'points_{i}', 1))
+            except (ValueError, TypeError):
                 points = 1.0
 
             # ================= TIME LIMIT =================
             if quiz.has_timer:
                 try:
-                    time_limit = int(request.form.get(f'time_limit_{i}', 30))
+                    time_limit = int(form.get(f'time_limit_{i}', 30))
                     time_limit = max(5, time_limit)
-                except:
+                except (ValueError, TypeError):
                     time_limit = 30
             else:
                 time_limit = 0
 
             # ================= PER QUESTION LEADERBOARD =================
-            show_leaderboard = True if request.form.get(f'show_leaderboard_{i}') == 'on' else False
-
-            # ================= CREATE QUESTION =================
-            new_question = Question(
-                quiz_id=quiz_id,
-                order=i + 1,
-                question=qtext,
-                question_text_plain=strip_html_tags(qtext),
-                question_type=qtype,
-                options=json.dumps(options) if options else None,
-                correct_answers=json.dumps(correct_answers) if correct_answers else None,
-                points=points,
-                time_limit=time_limit,
-                show_leaderboard=show_leaderboard,
-
-                # backward compatibility
-                option1=options[0]['text'] if len(options) > 0 else '',
-                option2=options[1]['text'] if len(options) > 1 else '',
-                option3=options[2]['text'] if len(options) > 2 else '',
-                option4=options[3]['text'] if len(options) > 3 else '',
-                answer=str(correct_answers[0]) if correct_answers else ''
-            )
-
-            db.session.add(new_question)
-            added = True
-
-            print(f"✅ Added question {i+1} | type={qtype} | points={points} | time={time_limit}")
-
-            i += 1
+            show_leaderboard = True if form.get(f'show_leaderboard_{i}') == 'on' else False
+
+            # ================= COLLECT QUESTION ROW =================
+            rows.append({
+                'quiz_id': quiz_id,
+                'order': i + 1,
+                'question': qtext,
+                # bulk inserts skip ORM events, so set the plain text here
+                'question_text_plain': html_to_text(qtext),
+                'question_type': qtype,
+                'options': options or None,
+                'correct_answers': correct_answers or None,
+                'points': points,
+                'time_limit': time_limit,
+                'show_leaderboard': show_leaderboard,
+            })
 
         # ================= FINAL COMMIT =================
-        if added:
-            db.session.commit()
+        if rows:
+            db.session.bulk_insert_mappings(Question, rows)
+        # Students' graded-question cache is keyed on this; bumped in the
+        # UPDATE itself so concurrent edits can't reuse a version
+        quiz.content_version = Quiz.content_version + 1
+        db.session.commit()
+
+        if rows:
+            current_app.logger.debug('Quiz %s: added %s questions', quiz_id, len(rows))
             flash(f'✅ {question_count} questions added successfully!', 'success')
         else:
             flash('⚠️ No valid questions were added.', 'warning')
@@ -257,7 +281,7 @@ def add_question(quiz_id):
 @require_admin
 def end_questions(quiz_id):
     """Lock quiz questions"""
-    quiz = Quiz.query.get_or_404(quiz_id)
+    quiz = db.get_or_404(Quiz, quiz_id)
     quiz.is_locked = True
     db.session.commit()
     flash('Question adding locked.', 'info')
@@ -268,15 +292,14 @@ def end_questions(quiz_id):
 @require_admin
 def publish_quiz(quiz_id):
     """Publish quiz"""
-    quiz = Quiz.query.get_or_404(quiz_id)
+    quiz = db.get_or_404(Quiz, quiz_id)
     
     if not quiz.is_locked:
         flash('Lock questions first before publishing!', 'error')
         return redirect(url_for('admin.quizzes'))
     
-    # FIXED: Check if quiz has questions
-    question_count = Question.query.filter_by(quiz_id=quiz_id).count()
-    if question_count == 0:
+    # FIXED: Check if quiz has questions (selectin-loaded with the quiz, no COUNT)
+    if not quiz.questions:
         flash('Cannot publish a quiz with no questions!', 'error')
         return redirect(url_for('admin.add_question', quiz_id=quiz_id))
     
@@ -289,10 +312,12 @@ def publish_quiz(quiz_id):
     quiz.is_paused = False
     
     if not quiz.join_code:
-        quiz.join_code = generate_join_code()
+        assign_join_code(quiz)
     
-    quiz_state[quiz.id] = {'current_qindex': 0}
+    QuizStateService.set(quiz.id, {'current_qindex': 0})
     db.session.commit()
+    DashboardService.invalidate()
+    PublishedQuizService.invalidate()
     
     ist_time = utc_to_ist(quiz.published_at)
     flash(
@@ -307,7 +332,7 @@ def publish_quiz(quiz_id):
 @require_admin
 def pause_quiz(quiz_id):
     """Pause quiz"""
-    quiz = Quiz.query.get_or_404(quiz_id)
+    quiz = db.get_or_404(Quiz, quiz_id)
     if quiz.is_active and not quiz.is_paused:
         quiz.is_paused = True
         quiz.paused_at = now_utc()
@@ -320,7 +345,7 @@ def pause_quiz(quiz_id):
 @require_admin
 def resume_quiz(quiz_id):
     """Resume paused quiz"""
-    quiz = Quiz.query.get_or_404(quiz_id)
+    quiz = db.get_or_404(Quiz, quiz_id)
     if quiz.is_active and quiz.is_paused:
         paused_time = (now_utc() - quiz.paused_at).total_seconds()
         quiz.paused_seconds += int(paused_time)
@@ -335,15 +360,17 @@ def resume_quiz(quiz_id):
 @require_admin
 def stop_quiz(quiz_id):
     """Stop quiz"""
-    quiz = Quiz.query.get_or_404(quiz_id)
+    quiz = db.get_or_404(Quiz, quiz_id)
     quiz.is_active = False
     quiz.is_published = False
     quiz.is_paused = False
     quiz.paused_at = None
     quiz.paused_seconds = 0
     db.session.commit()
+    DashboardService.invalidate()
+    PublishedQuizService.invalidate()
     
-    quiz_state.pop(quiz_id, None)
+    QuizStateService.clear(quiz_id)
     
     socketio.emit(
         'quiz_stopped',
@@ -359,15 +386,14 @@ def stop_quiz(quiz_id):
 @require_admin
 def start_quiz(quiz_id):
     """Start quiz"""
-    quiz = Quiz.query.get_or_404(quiz_id)
+    quiz = db.get_or_404(Quiz, quiz_id)
     
     if not quiz.is_published:
         flash('Quiz is not published yet!', 'error')
         return redirect(url_for('admin.quizzes'))
     
-    # FIXED: Check if quiz has questions
-    question_count = Question.query.filter_by(quiz_id=quiz_id).count()
-    if question_count == 0:
+    # FIXED: Check if quiz has questions (selectin-loaded with the quiz, no COUNT)
+    if not quiz.questions:
         flash('Cannot start a quiz with no questions!', 'error')
         return redirect(url_for('admin.add_question', quiz_id=quiz_id))
     
@@ -375,30 +401,35 @@ def start_quiz(quiz_id):
         flash('Quiz is already active!', 'warning')
         return redirect(url_for('admin.live_control', quiz_id=quiz_id))
     
-    print(f"\n{'='*60}")
-    print(f"STARTING QUIZ: {quiz.title} (ID: {quiz_id})")
-    print(f"{'='*60}")
-    
     # Clear previous session data
     cleared = clear_quiz_session_data(quiz_id)
-    print(f"✓ Cleared {cleared['partial_answers_cleared']} old answers")
+    current_app.logger.info(
+        'Starting quiz %s (%s), cleared %s old answers',
+        quiz_id, quiz.title, cleared['partial_answers_cleared']
+    )
     
     # Start the quiz
     quiz.is_active = True
     quiz.is_paused = False
     
     # Initialize quiz state
-    quiz_state[quiz_id] = {
+    state = {
         'current_qindex': 0,
-        'started_at': time.time()
+        'started_at': time.time(),
+        # Lets the next-question socket handler skip the COUNT query
+        'total_questions': len(quiz.questions)
     }
     
     # Only add overall timer if it's enabled (not None and > 0)
     if quiz.overall_timer and quiz.overall_timer > 0:
-        quiz_state[quiz_id]['overall_timer'] = quiz.overall_timer * 60
-        quiz_state[quiz_id]['overall_started_at'] = time.time()
+        state['overall_timer'] = quiz.overall_timer * 60
+        state['overall_started_at'] = time.time()
+    
+    QuizStateService.set(quiz_id, state)
     
     db.session.commit()
+    DashboardService.invalidate()
+    PublishedQuizService.invalidate()
     
     # Notify all students in waiting room
     socketio.emit('begin_quiz', {
@@ -422,11 +453,7 @@ def start_quiz(quiz_id):
 @require_admin
 def reset_quiz(quiz_id):
     """Reset quiz completely"""
-    quiz = Quiz.query.get_or_404(quiz_id)
-    
-    print(f"\n{'='*60}")
-    print(f"RESETTING QUIZ: {quiz.title} (ID: {quiz_id})")
-    print(f"{'='*60}")
+    quiz = db.get_or_404(Quiz, quiz_id)
     
     cleared = clear_quiz_session_data(quiz_id)
     
@@ -435,14 +462,15 @@ def reset_quiz(quiz_id):
     quiz.paused_at = None
     quiz.paused_seconds = 0
     
-    if quiz_id in quiz_state:
-        del quiz_state[quiz_id]
+    QuizStateService.clear(quiz_id)
     
     db.session.commit()
+    DashboardService.invalidate()
     
-    print(f"✓ Quiz reset complete")
-    print(f"✓ Cleared {cleared['partial_answers_cleared']} answers")
-    print(f"{'='*60}\n")
+    current_app.logger.info(
+        'Reset quiz %s (%s), cleared %s answers',
+        quiz_id, quiz.title, cleared['partial_answers_cleared']
+    )
     
     flash(
         f'Quiz "{quiz.title}" has been reset. '
@@ -456,18 +484,19 @@ def reset_quiz(quiz_id):
 @require_admin
 def live_control(quiz_id):
     """Live quiz control"""
-    quiz = Quiz.query.get_or_404(quiz_id)
-    questions = Question.query.filter_by(quiz_id=quiz_id).order_by(Question.order).all()
+    quiz = db.get_or_404(Quiz, quiz_id, options=[noload(Quiz.questions)])
+    questions = live_question_rows(quiz_id)
     
-    current_index = quiz_state.get(quiz_id, {}).get('current_qindex', 0)
+    state = QuizStateService.get(quiz_id)
+    current_index = state.get('current_qindex', 0)
     current_question = questions[current_index] if current_index < len(questions) else None
     
     # Calculate elapsed time for overall timer - only if enabled
     elapsed_seconds = 0
     remaining_seconds = 0
-    if (quiz.has_timer and quiz.is_active and quiz_id in quiz_state and 
+    if (quiz.has_timer and quiz.is_active and state and 
         quiz.overall_timer and quiz.overall_timer > 0):
-        started_at = quiz_state[quiz_id].get('overall_started_at')
+        started_at = state.get('overall_started_at')
         if started_at:
             elapsed_seconds = int(time.time() - started_at - quiz.paused_seconds)
             total_seconds = quiz.overall_timer * 60
@@ -489,11 +518,11 @@ def live_control(quiz_id):
 @require_admin
 def live_leaderboard(quiz_id):
     """Admin live leaderboard view"""
-    quiz = Quiz.query.get_or_404(quiz_id)
+    quiz = db.get_or_404(Quiz, quiz_id, options=[noload(Quiz.questions)])
     
-    questions = Question.query.filter_by(quiz_id=quiz_id).order_by(Question.order).all()
+    questions = live_question_rows(quiz_id)
     total_questions = len(questions)
-    current_index = quiz_state.get(quiz_id, {}).get('current_qindex', 0)
+    current_index = QuizStateService.get(quiz_id).get('current_qindex', 0)
     
     current_question = None
     if questions and 0 <= current_index < len(questions):
@@ -520,35 +549,40 @@ def live_leaderboard(quiz_id):
 @require_admin
 def analytics(quiz_id):
     """Quiz analytics"""
-    quiz = Quiz.query.get_or_404(quiz_id)
+    quiz = db.get_or_404(Quiz, quiz_id)
     
-    total_participants = db.session.query(
-        PartialAnswer.student
-    ).filter_by(quiz_id=quiz_id).distinct().count()
+    correct_case = db.case((PartialAnswer.is_correct == True, 1), else_=0)
     
-    total_answers = PartialAnswer.query.filter_by(quiz_id=quiz_id).count()
-    correct_answers = PartialAnswer.query.filter_by(
-        quiz_id=quiz_id, is_correct=True
-    ).count()
+    # Whole-quiz totals in one round-trip
+    total_participants, total_answers, correct_answers, avg_time = db.session.query(
+        func.count(func.distinct(PartialAnswer.student)),
+        func.count(PartialAnswer.id),
+        func.coalesce(func.sum(correct_case), 0),
+        func.avg(PartialAnswer.time_taken)
+    ).filter_by(quiz_id=quiz_id).one()
     
     accuracy_rate = int((correct_answers / total_answers) * 100) if total_answers else 0
-    
-    avg_time = int(
-        db.session.query(func.avg(PartialAnswer.time_taken))
-        .filter_by(quiz_id=quiz_id).scalar() or 0
-    )
+    avg_time = int(avg_time or 0)
+    
+    # Per-question totals: question_id -> (attempts, correct, avg time)
+    stats = {
+        row[0]: row[1:]
+        for row in db.session.query(
+            PartialAnswer.question_id,
+            func.count(PartialAnswer.id),
+            func.sum(correct_case),
+            func.avg(PartialAnswer.time_taken)
+        ).filter_by(quiz_id=quiz_id).group_by(PartialAnswer.question_id).all()
+    }
     
     question_data = []
-    questions = Question.query.filter_by(quiz_id=quiz_id).order_by(Question.order).all()
+    total_points = 0
+    questions = quiz.questions  # selectin-loaded with the quiz, already ordered
     for q in questions:
-        total_q = PartialAnswer.query.filter_by(
-            quiz_id=quiz_id, question_id=q.id
-        ).count()
-        correct_q = PartialAnswer.query.filter_by(
-            quiz_id=quiz_id, question_id=q.id, is_correct=True
-        ).count()
-        avg_q_time = db.session.query(func.avg(PartialAnswer.time_taken))\
-            .filter_by(quiz_id=quiz_id, question_id=q.id).scalar() or 0
+        total_points += q.points or 0
+        total_q, correct_q, avg_q_time = stats.get(q.id, (0, 0, 0))
+        correct_q = int(correct_q or 0)
+        avg_q_time = avg_q_time or 0
         
         correct_pct = int((correct_q / total_q) * 100) if total_q else 0
         difficulty = 'easy' if correct_pct > 70 else 'medium' if correct_pct > 40 else 'hard'
@@ -582,7 +616,7 @@ def analytics(quiz_id):
         question_data=question_data,
         top_students=top_students,
         total_questions=len(questions),
-        total_points=sum(q.points for q in questions)
+        total_points=total_points
     )
 
 
@@ -590,7 +624,7 @@ def analytics(quiz_id):
 @require_admin
 def delete_quiz(quiz_id):
     """Delete quiz and all associated data"""
-    quiz = Quiz.query.get_or_404(quiz_id)
+    quiz = db.get_or_404(Quiz, quiz_id)
     
     Question.query.filter_by(quiz_id=quiz_id).delete()
     PartialAnswer.query.filter_by(quiz_id=quiz_id).delete()
@@ -598,8 +632,11 @@ def delete_quiz(quiz_id):
     
     db.session.delete(quiz)
     db.session.commit()
+    DashboardService.invalidate()
+    LeaderboardService.invalidate(quiz_id)
+    PublishedQuizService.invalidate()
     
-    quiz_state.pop(quiz_id, None)
+    QuizStateService.clear(quiz_id)
     
     flash('Quiz and all associated data deleted successfully.', 'info')
     return redirect(url_for('admin.quizzes'))
@@ -613,7 +650,7 @@ def rename_quiz():
     new_title = request.form.get('new_title')
     
     if quiz_id and new_title:
-        quiz = Quiz.query.get(quiz_id)
+        quiz = db.session.get(Quiz, quiz_id)
         if quiz:
             quiz.title = new_title
             db.session.commit()
@@ -634,7 +671,7 @@ def handle_admin_start_quiz(data):
     if not quiz_id:
         return {'error': 'No quiz_id provided'}
     
-    quiz = Quiz.query.get(quiz_id)
+    quiz = db.session.get(Quiz, quiz_id)
     if not quiz:
         return {'error': 'Quiz not found'}
     
@@ -643,16 +680,22 @@ def handle_admin_start_quiz(data):
     quiz.is_active = True
     quiz.is_paused = False
     
-    quiz_state[quiz_id] = {
+    state = {
         'current_qindex': 0,
-        'started_at': time.time()
+        'started_at': time.time(),
+        # Lets the next-question socket handler skip the COUNT query
+        'total_questions': len(quiz.questions)
     }
     
     if quiz.overall_timer and quiz.overall_timer > 0:
-        quiz_state[quiz_id]['overall_started_at'] = time.time()
-        quiz_state[quiz_id]['overall_timer'] = quiz.overall_timer * 60
+        state['overall_started_at'] = time.time()
+        state['overall_timer'] = quiz.overall_timer * 60
+    
+    QuizStateService.set(quiz_id, state)
     
     db.session.commit()
+    DashboardService.invalidate()
+    PublishedQuizService.invalidate()
     
     socketio.emit(
         'quiz_started',
@@ -674,36 +717,21 @@ def handle_admin_start_quiz(data):
     }
 
 
-@socketio.on('admin_next_question')
-def handle_admin_next_question(data):
-    """Admin moves to next question"""
-    quiz_id = data.get('quiz_id')
-    
-    if quiz_id in quiz_state:
-        quiz_state[quiz_id]['current_qindex'] = quiz_state[quiz_id].get('current_qindex', 0) + 1
-        
-        socketio.emit(
-            'next_question',
-            {'quiz_id': quiz_id, 'qindex': quiz_state[quiz_id]['current_qindex']},
-            room=f"quiz_{quiz_id}"
-        )
-    
-    return {'success': True}
-
-
 @socketio.on('admin_previous_question')
 def handle_admin_previous_question(data):
     """Admin moves to previous question"""
     quiz_id = data.get('quiz_id')
     
-    if quiz_id in quiz_state:
-        current = quiz_state[quiz_id].get('current_qindex', 0)
-        quiz_state[quiz_id]['current_qindex'] = max(0, current - 1)
+    state = QuizStateService.get(quiz_id)
+    if state:
+        # None on the first question: nothing moved, so nothing to announce
+        new_qindex = QuizStateService.step_back(quiz_id)
         
-        socketio.emit(
-            'previous_question',
-            {'quiz_id': quiz_id, 'qindex': quiz_state[quiz_id]['current_qindex']},
-            room=f"quiz_{quiz_id}"
-        )
+        if new_qindex is not None:
+            socketio.emit(
+                'previous_question',
+                {'quiz_id': quiz_id, 'qindex': new_qindex},
+                room=f"quiz_{quiz_id}"
+            )
     
     return {'success': True}
\ No newline at end of file
@@ -7,6 +7,7 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from app.extensions import db
 from app.models import User
 from app.utils import get_current_user
+from app.services import DashboardService
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -39,6 +40,7 @@ def register():
             )
             db.session.add(user)
             db.session.commit()
+            DashboardService.invalidate()
             flash('Registration successful! Please login.', 'success')
             return redirect(url_for('auth.login'))
 
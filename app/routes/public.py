@@ -1,8 +1,9 @@
 from flask import Blueprint, redirect, url_for, session, flash
-from app.models import Quiz
+from app.services import PublishedQuizService
 
 public_bp = Blueprint('public', __name__)
 
+
 @public_bp.route('/quiz/join/<code>')
 def join_quiz_public(code):
     """
@@ -10,12 +11,9 @@ def join_quiz_public(code):
     Uses EXISTING login (username + password)
     """
 
-    quiz = Quiz.query.filter_by(
-        join_code=code.upper(),
-        is_published=True
-    ).first()
+    quiz_id = PublishedQuizService.resolve_join_code(code.upper())
 
-    if not quiz:
+    if quiz_id is None:
         return "Quiz not found or inactive", 404
 
     # 🚫 Admin cannot attempt quiz
@@ -27,9 +25,9 @@ def join_quiz_public(code):
     if 'user_id' not in session:
         session['next_url'] = url_for(
             'student.waiting_room',
-            quiz_id=quiz.id
+            quiz_id=quiz_id
         )
         return redirect(url_for('auth.login'))
 
     # ✅ Logged in student → direct join
-    return redirect(url_for('student.waiting_room', quiz_id=quiz.id))
+    return redirect(url_for('student.waiting_room', quiz_id=quiz_id))
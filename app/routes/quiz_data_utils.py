@@ -2,9 +2,11 @@
 Quiz Data Management Utilities
 Helper functions for managing quiz data lifecycle
 """
+from flask import current_app
+from sqlalchemy import func
 from app.models import PartialAnswer, Result, Quiz
 from app.extensions import db
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 
 def clear_quiz_session_data(quiz_id):
@@ -21,26 +23,20 @@ def clear_quiz_session_data(quiz_id):
     Returns:
         Dict with counts of deleted records
     """
-    print(f"\n{'='*60}")
-    print(f"CLEARING SESSION DATA FOR QUIZ {quiz_id}")
-    print(f"{'='*60}")
-    
-    # Delete all partial answers
-    partial_count = PartialAnswer.query.filter_by(quiz_id=quiz_id).count()
-    PartialAnswer.query.filter_by(quiz_id=quiz_id).delete()
+    # Delete all partial answers (rowcount doubles as the cleared count)
+    partial_count = PartialAnswer.query.filter_by(quiz_id=quiz_id).delete(synchronize_session=False)
     
     # Note: We might want to keep Results for history, so only delete if needed
     # For now, we'll keep results and only clear partial answers
     
     db.session.commit()
     
-    print(f"✓ Deleted {partial_count} partial answers")
-    print(f"{'='*60}\n")
+    current_app.logger.debug('Quiz %s: cleared %s partial answers', quiz_id, partial_count)
     
     return {
         'partial_answers_cleared': partial_count,
         'quiz_id': quiz_id,
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': datetime.now(timezone.utc).isoformat()
     }
 
 
@@ -56,23 +52,24 @@ def clear_student_quiz_data(quiz_id, student_name):
     Returns:
         Dict with counts of deleted records
     """
-    print(f"\nClearing data for student '{student_name}' in quiz {quiz_id}")
-    
     # Delete partial answers
     partial_count = PartialAnswer.query.filter_by(
         quiz_id=quiz_id,
         student=student_name
-    ).delete()
+    ).delete(synchronize_session=False)
     
     # Delete result
     result_count = Result.query.filter_by(
         quiz_id=quiz_id,
         student=student_name
-    ).delete()
+    ).delete(synchronize_session=False)
     
     db.session.commit()
     
-    print(f"✓ Deleted {partial_count} partial answers and {result_count} results")
+    current_app.logger.debug(
+        'Quiz %s: cleared %s partial answers and %s results for %r',
+        quiz_id, partial_count, result_count, student_name
+    )
     
     return {
         'partial_answers_cleared': partial_count,
@@ -99,42 +96,43 @@ def validate_quiz_data_integrity(quiz_id):
     
     from app.models import Question
     
-    # Get all questions
-    questions = Question.query.filter_by(quiz_id=quiz_id).all()
-    question_ids = [q.id for q in questions]
-    
-    # Get all partial answers
-    partials = PartialAnswer.query.filter_by(quiz_id=quiz_id).all()
-    
-    # Check for orphaned partial answers (question doesn't exist)
-    orphaned = [p for p in partials if p.question_id not in question_ids]
-    
-    # Get unique students
-    students = set(p.student for p in partials)
-    
-    # Check for partial answers with wrong quiz_id
-    wrong_quiz = PartialAnswer.query.filter(
-        PartialAnswer.quiz_id != quiz_id,
-        PartialAnswer.question_id.in_(question_ids)
-    ).all()
+    # Every check is a COUNT in SQL; only the scalars come back
+    question_ids = db.session.query(Question.id).filter(Question.quiz_id == quiz_id)
+    quiz_answers = db.session.query(PartialAnswer).filter(PartialAnswer.quiz_id == quiz_id)
+    
+    total_questions, total_partials, unique_students, orphaned, wrong_quiz = db.session.query(
+        db.session.query(func.count(Question.id))
+            .filter(Question.quiz_id == quiz_id).scalar_subquery(),
+        quiz_answers.with_entities(func.count(PartialAnswer.id)).scalar_subquery(),
+        quiz_answers.with_entities(func.count(func.distinct(PartialAnswer.student))).scalar_subquery(),
+        # Orphaned partial answers (question doesn't exist in this quiz)
+        quiz_answers.with_entities(func.count(PartialAnswer.id))
+            .filter(~PartialAnswer.question_id.in_(question_ids)).scalar_subquery(),
+        # Partial answers for this quiz's questions filed under another quiz_id
+        db.session.query(func.count(PartialAnswer.id)).filter(
+            PartialAnswer.quiz_id != quiz_id,
+            PartialAnswer.question_id.in_(question_ids)
+        ).scalar_subquery()
+    ).one()
     
     validation_result = {
         'quiz_id': quiz_id,
         'quiz_title': quiz.title,
-        'total_questions': len(questions),
-        'total_partial_answers': len(partials),
-        'unique_students': len(students),
-        'orphaned_answers': len(orphaned),
-        'wrong_quiz_answers': len(wrong_quiz),
-        'is_valid': len(orphaned) == 0 and len(wrong_quiz) == 0
+        'total_questions': total_questions,
+        'total_partial_answers': total_partials,
+        'unique_students': unique_students,
+        'orphaned_answers': orphaned,
+        'wrong_quiz_answers': wrong_quiz,
+        'is_valid': orphaned == 0 and wrong_quiz == 0
     }
     
     if not validation_result['is_valid']:
-        print(f"\n⚠️  VALIDATION FAILED FOR QUIZ {quiz_id}")
-        print(f"Orphaned answers: {len(orphaned)}")
-        print(f"Wrong quiz answers: {len(wrong_quiz)}")
+        current_app.logger.warning(
+            'Quiz %s failed validation: %s orphaned answers, %s wrong-quiz answers',
+            quiz_id, orphaned, wrong_quiz
+        )
     else:
-        print(f"\n✓ Quiz {quiz_id} data is valid")
+        current_app.logger.debug('Quiz %s data is valid', quiz_id)
     
     return validation_result
 
@@ -150,22 +148,17 @@ def cleanup_old_partial_answers(days=7):
     Returns:
         Number of records deleted
     """
-    from datetime import timedelta
-    
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
+    # Aware, to compare like-for-like with the TIMESTAMPTZ column
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
     
-    old_partials = PartialAnswer.query.filter(
+    # Single bulk DELETE (range scan on the submitted_at index)
+    count = PartialAnswer.query.filter(
         PartialAnswer.submitted_at < cutoff_date
-    ).all()
-    
-    count = len(old_partials)
-    
-    for partial in old_partials:
-        db.session.delete(partial)
+    ).delete(synchronize_session=False)
     
     db.session.commit()
     
-    print(f"Cleaned up {count} partial answers older than {days} days")
+    current_app.logger.debug('Cleaned up %s partial answers older than %s days', count, days)
     
     return count
 
@@ -180,33 +173,35 @@ def get_quiz_participation_stats(quiz_id):
     Returns:
         Dict with participation stats
     """
-    partials = PartialAnswer.query.filter_by(quiz_id=quiz_id).all()
-    
-    students = set(p.student for p in partials)
+    # One row per student with their answer count, instead of loading every answer
+    rows = db.session.query(
+        PartialAnswer.student,
+        func.count(PartialAnswer.id)
+    ).filter_by(quiz_id=quiz_id).group_by(PartialAnswer.student).all()
     
     from app.models import Question
     total_questions = Question.query.filter_by(quiz_id=quiz_id).count()
     
     # Calculate completion rates
     student_progress = {}
-    for student in students:
-        student_partials = [p for p in partials if p.student == student]
+    completed_students = 0
+    total_answers = 0
+    for student, answered in rows:
         student_progress[student] = {
-            'answered': len(student_partials),
+            'answered': answered,
             'total': total_questions,
-            'percentage': (len(student_partials) / total_questions * 100) if total_questions > 0 else 0
+            'percentage': (answered / total_questions * 100) if total_questions > 0 else 0
         }
-    
-    # Count students who completed
-    completed_students = sum(1 for progress in student_progress.values() 
-                            if progress['answered'] == total_questions)
+        total_answers += answered
+        if answered == total_questions:
+            completed_students += 1
     
     return {
         'quiz_id': quiz_id,
-        'total_students': len(students),
+        'total_students': len(rows),
         'completed_students': completed_students,
-        'in_progress_students': len(students) - completed_students,
+        'in_progress_students': len(rows) - completed_students,
         'total_questions': total_questions,
-        'total_answers_submitted': len(partials),
+        'total_answers_submitted': total_answers,
         'student_progress': student_progress
     }
\ No newline at end of file
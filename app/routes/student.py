@@ -6,25 +6,21 @@ LEADERBOARD FIX: Only show current quiz data, filter out past quiz data
 ENHANCED: Support for new question types, leaderboard toggles, overall timer
 FIXED: Added quiz_id to render_template to fix POST /student/quiz/null 404 error
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
-from app.extensions import db, socketio, quiz_state
+from functools import lru_cache
+from types import MappingProxyType
+from typing import NamedTuple
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, Response, current_app, abort
+from sqlalchemy.orm import noload
+from app.extensions import db, socketio, SocketJSON
 from app.models import Quiz, Question, PartialAnswer, Result
-from app.utils import require_student, ensure_guest_student, now_utc
-from app.services import ScoringService, LeaderboardService
+from app.utils import require_student, ensure_guest_student, strip_html_tags
+from app.services import ScoringService, LeaderboardService, QuizStateService, DashboardService, PublishedQuizService
+import json
 import time
-import re
 
 student_bp = Blueprint('student', __name__)
 
 
-def strip_html_tags(html_text):
-    """Strip HTML tags from text for plain text comparison"""
-    if not html_text:
-        return ""
-    clean = re.compile('<.*?>')
-    return re.sub(clean, '', html_text)
-
-
 def get_student_name():
     """Get current student name from session"""
     if session.get('user_id') == -1 or session.get('user_id') is None:
@@ -42,31 +38,18 @@ def dashboard():
 @student_bp.route('/quizzes')
 def quizzes():
     """List available quizzes - NO LOGIN REQUIRED (allows guests)"""
-    print(f"\n{'='*60}")
-    print("STUDENT QUIZZES PAGE - DEBUG")
-    print(f"{'='*60}")
-    
     # CRITICAL: Block only admins, allow students AND guests
     if session.get('role') == 'admin':
-        print("⚠️ Admin detected, redirecting to admin dashboard")
         flash('Admins cannot join quizzes ❌', 'danger')
         return redirect(url_for('admin.dashboard'))
     
     # Ensure guest session
     ensure_guest_student()
     
-    # SHOW ALL PUBLISHED QUIZZES
-    all_quizzes = Quiz.query.filter_by(is_published=True).order_by(Quiz.published_at.desc()).all()
-    
-    print(f"Found {len(all_quizzes)} published quizzes:")
+    # SHOW ALL PUBLISHED QUIZZES (rows carry question_count; cached for a few seconds)
+    all_quizzes = PublishedQuizService.listing()
     
-    # ADD QUESTION COUNT AND SETTINGS FOR TEMPLATE
-    for quiz in all_quizzes:
-        quiz.question_count = Question.query.filter_by(quiz_id=quiz.id).count()
-        print(f"  - {quiz.title}: active={quiz.is_active}, published={quiz.is_published}, questions={quiz.question_count}")
-    
-    print(f"Sending {len(all_quizzes)} quizzes to template")
-    print(f"{'='*60}\n")
+    current_app.logger.debug('Student quiz list: %s published quizzes', len(all_quizzes))
     
     return render_template('student_quiz.html', quizzes=all_quizzes)
 
@@ -125,7 +108,7 @@ def waiting_room(quiz_id):
     
     ensure_guest_student()
     
-    quiz = Quiz.query.get_or_404(quiz_id)
+    quiz = db.get_or_404(Quiz, quiz_id)
     
     # If admin already started it, redirect to the actual quiz
     if quiz.is_active:
@@ -140,7 +123,7 @@ def waiting_room(quiz_id):
 @student_bp.route('/test-waiting-room/<int:quiz_id>')
 def test_waiting_room(quiz_id):
     """Test waiting room directly"""
-    quiz = Quiz.query.get_or_404(quiz_id)
+    quiz = db.get_or_404(Quiz, quiz_id)
     return f"Waiting room test successful! Quiz: {quiz.title}, ID: {quiz.id}"
 
 
@@ -156,37 +139,85 @@ def check_answer_correctness(question, selected_answer):
     
     if question_type == 'multiple-choice':
         # Single correct answer
-        correct_answers = question.get_correct_answers()
-        return str(selected_answer).strip() in [str(ans).strip() for ans in correct_answers]
+        return str(selected_answer).strip() in question.correct_choice_set
     
     elif question_type == 'checkbox':
         # Multiple correct answers - need to compare sets
+        # (empty / 'No Answer' was rejected above)
         try:
-            import json
             student_answers = json.loads(selected_answer) if isinstance(selected_answer, str) else selected_answer
-            if not isinstance(student_answers, list):
-                student_answers = [student_answers]
-            
-            correct_answers = [str(ans) for ans in question.get_correct_answers()]
-            student_answers = [str(ans) for ans in student_answers]
-            
-            return set(student_answers) == set(correct_answers)
-        except:
+        except ValueError:
             return False
+        if not isinstance(student_answers, (list, tuple)):
+            student_answers = (student_answers,)
+        
+        return frozenset(map(str, student_answers)) == question.correct_answer_set
     
     elif question_type in ['short-answer', 'paragraph']:
         # Text comparison - case insensitive, strip HTML
         student_text = strip_html_tags(str(selected_answer)).strip().lower()
-        correct_answers = [strip_html_tags(str(ans)).strip().lower() 
-                          for ans in question.get_correct_answers()]
-        
-        return student_text in correct_answers if correct_answers else False
+        return student_text in question.correct_text_set
     
     else:
         # Fallback to old method
         return str(selected_answer).strip() == str(question.answer).strip()
 
 
+class GradedQuestion(NamedTuple):
+    """
+    Read-only copy of the Question fields used to show and grade a question
+    Safe to share between requests, threads and greenlets (no ORM state)
+    """
+    id: int
+    question: str
+    question_type: str
+    options: tuple
+    correct_answers: tuple
+    points: float
+    time_limit: int
+    show_leaderboard: bool
+    answer: str
+    correct_answer_set: frozenset
+    correct_choice_set: frozenset
+    correct_text_set: frozenset
+
+    @classmethod
+    def from_question(cls, question):
+        return cls(
+            id=question.id,
+            question=question.question,
+            question_type=question.question_type,
+            options=tuple(MappingProxyType(dict(opt)) for opt in question.get_options_with_images()),
+            correct_answers=tuple(question.get_correct_answers()),
+            points=question.points,
+            time_limit=question.time_limit,
+            show_leaderboard=question.show_leaderboard,
+            answer=question.answer,
+            correct_answer_set=question.correct_answer_set,
+            correct_choice_set=question.correct_choice_set,
+            correct_text_set=question.correct_text_set,
+        )
+
+    def get_options_with_images(self) -> list:
+        return list(self.options)
+
+    def get_correct_answers(self) -> list:
+        return list(self.correct_answers)
+
+
+@lru_cache(maxsize=1024)
+def graded_questions(quiz_id, content_version):
+    """
+    Questions of one quiz version by id, shared across requests in this worker
+    Admin edits bump Quiz.content_version, so stale entries are simply never
+    hit again and age out of the LRU
+    """
+    questions = Question.query.filter_by(quiz_id=quiz_id).order_by(Question.order).all()
+    return MappingProxyType({
+        question.id: GradedQuestion.from_question(question) for question in questions
+    })
+
+
 def calculate_question_points(question, is_correct, time_taken, quiz):
     """Calculate points for a question based on type and correctness"""
     if not is_correct:
@@ -212,17 +243,14 @@ def calculate_question_points(question, is_correct, time_taken, quiz):
 @student_bp.route('/quiz/<int:quiz_id>', methods=['GET', 'POST'])
 def attempt_quiz(quiz_id):
 
-    print("\n" + "="*60)
-    print(f"ATTEMPT QUIZ - Quiz ID: {quiz_id}")
-    print("="*60)
-
     # Block admins only
     if session.get('role') == 'admin':
         flash('Admins cannot solve quizzes ❌', 'danger')
         return redirect(url_for('admin.dashboard'))
 
     ensure_guest_student()
-    quiz = Quiz.query.get_or_404(quiz_id)
+    # Only one question is shown/graded per request; don't selectin-load them all
+    quiz = db.get_or_404(Quiz, quiz_id, options=[noload(Quiz.questions)])
 
     if not quiz.is_active:
         flash('Quiz is not active yet.', 'info')
@@ -234,11 +262,11 @@ def attempt_quiz(quiz_id):
     if quiz.is_paused:
         return render_template('quiz_closed.html', message='Quiz is paused.')
 
-    questions = Question.query.filter_by(
-        quiz_id=quiz_id
-    ).order_by(Question.order).all()
+    # Served from the per-worker cache; no question query in steady state
+    questions = graded_questions(quiz_id, quiz.content_version)
+    total_questions = len(questions)
 
-    if not questions:
+    if not total_questions:
         return render_template(
             'quiz_closed.html',
             message='No questions added yet.'
@@ -254,15 +282,9 @@ def attempt_quiz(quiz_id):
         selected_answer = request.form.get('selected_answer')
         time_taken = int(request.form.get('time_taken', 0))
 
-        current_question_obj = Question.query.get_or_404(question_id)
-
-        # Prevent duplicate submission
-        PartialAnswer.query.filter_by(
-            quiz_id=quiz_id,
-            question_id=question_id,
-            student=student_name
-        ).delete()
-        db.session.commit()
+        current_question_obj = questions.get(question_id)
+        if current_question_obj is None:
+            abort(404)
 
         is_correct = check_answer_correctness(
             current_question_obj,
@@ -276,19 +298,16 @@ def attempt_quiz(quiz_id):
             quiz
         )
 
-        partial = PartialAnswer(
-            quiz_id=quiz_id,
-            question_id=question_id,
-            student=student_name,
+        # A resubmission replaces the earlier answer (single UPSERT)
+        PartialAnswer.upsert(
+            quiz_id,
+            question_id,
+            student_name,
             is_correct=is_correct,
             time_taken=time_taken,
             points=question_points,
-            submitted_at=now_utc(),
         )
 
-        db.session.add(partial)
-        db.session.commit()
-
         ScoringService.update_question_rank_bonuses(
             quiz_id,
             question_id
@@ -298,20 +317,14 @@ def attempt_quiz(quiz_id):
             current_question_obj
         )
 
-        total_questions = len(questions)
         is_last = (qindex >= total_questions - 1)
+        result_added = False
 
         # ================= QUIZ COMPLETE =================
         if is_last:
 
-            partials = PartialAnswer.query.filter_by(
-                quiz_id=quiz_id,
-                student=student_name
-            ).all()
-
-            score = sum(1 for p in partials if p.is_correct)
-            total_time = sum(p.time_taken for p in partials)
-            total_points = sum(p.points for p in partials)
+            # Sums come back from one aggregate row (sees the flushed upsert/bonuses)
+            score, total_time, total_points, _ = ScoringService.student_totals(quiz_id, student_name)
 
             existing = Result.query.filter_by(
                 quiz_id=quiz_id,
@@ -328,24 +341,20 @@ def attempt_quiz(quiz_id):
                     total_points=total_points
                 )
                 db.session.add(result)
-                db.session.commit()
-
-            return jsonify({
-                'success': True,
-                'is_correct': is_correct,
-                'correct_answer': str(current_question_obj.get_correct_answers()),
-                'student_complete': True,
-                'next_question': None,
-                'show_leaderboard': should_show_leaderboard
-            })
-
-        # ================= NEXT QUESTION =================
+                result_added = True
+
+        # Answer, rank bonuses and final result commit together
+        db.session.commit()
+        LeaderboardService.invalidate(quiz_id)
+        if result_added:
+            DashboardService.invalidate()
+
         return jsonify({
             'success': True,
             'is_correct': is_correct,
             'correct_answer': str(current_question_obj.get_correct_answers()),
-            'student_complete': False,
-            'next_question': qindex + 1,
+            'student_complete': is_last,
+            'next_question': None if is_last else qindex + 1,
             'show_leaderboard': should_show_leaderboard
         })
 
@@ -355,16 +364,15 @@ def attempt_quiz(quiz_id):
 
     if qindex is None:
         if quiz.has_timer:
-            qindex = quiz_state.get(quiz_id, {}).get('current_qindex', 0)
+            qindex = QuizStateService.get(quiz_id).get('current_qindex', 0)
         else:
             qindex = 0
 
-    total_questions = len(questions)
-
     if qindex >= total_questions:
         return redirect(url_for('student.result', quiz_id=quiz_id))
 
-    current_q = questions[qindex]
+    # Cached dict is in display order
+    current_q = list(questions.values())[max(qindex, 0)]
 
     current_question = {
         'id': current_q.id,
@@ -377,8 +385,9 @@ def attempt_quiz(quiz_id):
 
     remaining_seconds = None
     if quiz.has_timer and quiz.overall_timer:
-        if quiz_id in quiz_state and 'overall_started_at' in quiz_state[quiz_id]:
-            elapsed = int(time.time() - quiz_state[quiz_id]['overall_started_at'])
+        state = QuizStateService.get(quiz_id)
+        if 'overall_started_at' in state:
+            elapsed = int(time.time() - state['overall_started_at'])
             total_sec = quiz.overall_timer * 60
             remaining_seconds = max(0, total_sec - elapsed)
 
@@ -392,6 +401,7 @@ def attempt_quiz(quiz_id):
         current_question=current_question,
         total_questions=total_questions,
         curIdx=qindex,
+        current_index=qindex,  # normal_attempt_quiz.html reads this name
         questionType=current_q.question_type,
         timeLimit=current_q.time_limit,
         hasOverallTimer=True if quiz.overall_timer else False,
@@ -410,10 +420,6 @@ def leaderboard_live(quiz_id):
     Shows leaderboard after each question and waits for host to advance
     ENHANCED: Respects quiz and question leaderboard settings
     """
-    print(f"\n{'='*60}")
-    print("LEADERBOARD LIVE PAGE")
-    print(f"{'='*60}")
-    
     # CRITICAL: Block only admins
     if session.get('role') == 'admin':
         flash('Admins cannot join quizzes ❌', 'danger')
@@ -421,7 +427,8 @@ def leaderboard_live(quiz_id):
     
     ensure_guest_student()
     
-    quiz = Quiz.query.get_or_404(quiz_id)
+    # The page is a shell (standings come from /api/leaderboard), so skip the questions
+    quiz = db.get_or_404(Quiz, quiz_id, options=[noload(Quiz.questions)])
     
     # Check if leaderboard is enabled globally
     if not quiz.show_leaderboard_global:
@@ -431,13 +438,16 @@ def leaderboard_live(quiz_id):
     # Get qindex from URL (can be 'done' or a number)
     qindex = request.args.get('qindex', '0')
     
-    # Get current question for leaderboard settings
+    # Get current question's leaderboard setting (a single row, not the whole list)
+    current_question = None
     try:
         current_qindex = int(qindex) if qindex != 'done' else 0
-        questions = Question.query.filter_by(quiz_id=quiz_id).order_by(Question.order).all()
-        current_question = questions[current_qindex] if questions and current_qindex < len(questions) else None
-    except:
-        current_question = None
+        if current_qindex >= 0:
+            current_question = db.session.query(Question.id, Question.show_leaderboard)\
+                .filter_by(quiz_id=quiz_id).order_by(Question.order)\
+                .offset(current_qindex).first()
+    except ValueError:
+        pass
     
     # Check if leaderboard is enabled for this specific question
     if current_question and not current_question.show_leaderboard:
@@ -448,21 +458,17 @@ def leaderboard_live(quiz_id):
     if qindex == 'done':
         quiz_status = 'done'
         current_qindex = 0
-        print("Quiz Status: COMPLETE (done)")
     else:
         quiz_status = 'ongoing'
         try:
             current_qindex = int(qindex)
         except ValueError:
             current_qindex = 0
-        print(f"Quiz Status: ONGOING (question {current_qindex})")
     
-    print(f"Quiz ID: {quiz_id}")
-    print(f"Quiz Title: {quiz.title}")
-    print(f"QIndex from URL: {qindex}")
-    print(f"Current QIndex: {current_qindex}")
-    print(f"Show Leaderboard: {quiz.show_leaderboard_global}")
-    print(f"{'='*60}\n")
+    current_app.logger.debug(
+        'Live leaderboard: quiz %s %s (qindex=%r -> %s)',
+        quiz_id, quiz_status, qindex, current_qindex
+    )
     
     return render_template(
         'student_live_leaderboard.html',
@@ -485,10 +491,13 @@ def leaderboard(quiz_id):
     
     ensure_guest_student()
     
-    quiz = Quiz.query.get_or_404(quiz_id)
+    quiz = db.get_or_404(Quiz, quiz_id)
     
-    # Get final results
-    results = Result.query.filter_by(quiz_id=quiz_id).order_by(Result.total_points.desc()).all()
+    # Get final results as plain rows (no ORM instances to track)
+    results = db.session.query(
+        Result.student, Result.score, Result.total,
+        Result.total_points, Result.time_taken
+    ).filter_by(quiz_id=quiz_id).order_by(Result.total_points.desc()).all()
     
     return render_template(
         'student_live_leaderboard.html',
@@ -508,31 +517,37 @@ def quiz_report(history_id):
         return redirect(url_for('admin.dashboard'))
     
     # For guests, check if they own this history
-    history = Result.query.get_or_404(history_id)
+    history = db.get_or_404(Result, history_id)
     student_name = get_student_name()
     
     if history.student != student_name:
         flash('You do not have permission to view this report.', 'error')
         return redirect(url_for('student.history'))
     
-    quiz = Quiz.query.get(history.quiz_id)
-    partials = PartialAnswer.query.filter_by(
-        quiz_id=history.quiz_id,
-        student=student_name
-    ).all()
-    questions = Question.query.filter_by(quiz_id=history.quiz_id).order_by(Question.order).all()
+    quiz = db.session.get(Quiz, history.quiz_id, options=[noload(Quiz.questions)])
+    
+    # Questions in order, each outer-joined to this student's answer (if any)
+    rows = db.session.query(
+        Question.question, Question.question_type, Question.correct_answers,
+        PartialAnswer.is_correct, PartialAnswer.time_taken, PartialAnswer.points
+    ).outerjoin(PartialAnswer, db.and_(
+        PartialAnswer.quiz_id == Question.quiz_id,
+        PartialAnswer.question_id == Question.id,
+        PartialAnswer.student == student_name
+    )).filter(
+        Question.quiz_id == history.quiz_id
+    ).order_by(Question.order).all()
     
     question_details = []
-    for i, question in enumerate(questions):
-        answer = next((p for p in partials if p.question_id == question.id), None)
+    for i, row in enumerate(rows):
         question_details.append({
             'number': i + 1,
-            'text': question.question,
-            'type': question.question_type,
-            'is_correct': answer.is_correct if answer else False,
-            'time_taken': answer.time_taken if answer else 0,
-            'points': answer.points if answer else 0,
-            'correct_answer': question.get_correct_answers()
+            'text': row.question,
+            'type': row.question_type,
+            'is_correct': row.is_correct or False,
+            'time_taken': row.time_taken or 0,
+            'points': row.points or 0,
+            'correct_answer': row.correct_answers or []
         })
     
     return render_template(
@@ -548,17 +563,19 @@ def quiz_report(history_id):
 def history():
     """Student quiz history - REQUIRES LOGIN"""
     username = session.get('username')
-    quiz_history = (
-        Result.query
-        .filter_by(student=username)
+    # Quiz titles come from the same query (outer join: quiz may be deleted)
+    rows = (
+        db.session.query(Result, Quiz.title)
+        .outerjoin(Quiz, Quiz.id == Result.quiz_id)
+        .filter(Result.student == username)
         .order_by(Result.submitted_at.desc())
         .all()
     )
     
-    # Add quiz titles
-    for result in quiz_history:
-        quiz = Quiz.query.get(result.quiz_id)
-        result.quiz_title = quiz.title if quiz else 'Unknown Quiz'
+    quiz_history = []
+    for result, title in rows:
+        result.quiz_title = title or 'Unknown Quiz'
+        quiz_history.append(result)
     
     return render_template('student_history.html', history=quiz_history)
 
@@ -567,18 +584,24 @@ def history():
 # API ENDPOINTS
 # ========================================
 
+def polled_json_response(payload):
+    """
+    JSON response for endpoints clients poll every few seconds
+    orjson-encoded when available, with an ETag so an unchanged payload
+    is answered with an empty 304
+    """
+    response = Response(SocketJSON.dumps(payload), mimetype='application/json')
+    response.add_etag()
+    return response.make_conditional(request)
+
+
 @student_bp.route('/api/leaderboard/<int:quiz_id>')
 def api_leaderboard(quiz_id):
     """
     API: Get leaderboard data
     CRITICAL: Only return data for the specified quiz_id
     """
-    print(f"\n{'='*60}")
-    print(f"API LEADERBOARD REQUEST - Quiz ID: {quiz_id}")
-    print(f"{'='*60}")
-    
-    quiz = Quiz.query.get(quiz_id)
-    if not quiz or not quiz.show_leaderboard_global:
+    if not LeaderboardService.is_enabled(quiz_id):
         return jsonify({
             'quiz_id': quiz_id,
             'participants': 0,
@@ -586,19 +609,14 @@ def api_leaderboard(quiz_id):
             'message': 'Leaderboard disabled'
         })
     
-    # Build leaderboard ONLY for this quiz
-    leaderboard_data = LeaderboardService.build_leaderboard_payload(quiz_id)
+    # Build leaderboard ONLY for this quiz (entries carry quiz_id for frontend filtering)
+    payload = LeaderboardService.build_leaderboard_payload(quiz_id)
+    leaderboard_data = payload['entries']
     
-    # Add quiz_id to each entry for frontend filtering
-    for entry in leaderboard_data:
-        entry['quiz_id'] = quiz_id
-    
-    print(f'Returning {len(leaderboard_data)} entries for quiz {quiz_id}')
-    print(f"{'='*60}\n")
-    
-    return jsonify({
+    return polled_json_response({
         'quiz_id': quiz_id,
         'participants': len(leaderboard_data),
+        'total_questions': payload['total_questions'],
         'leaderboard': leaderboard_data,
     })
 
@@ -608,10 +626,7 @@ def api_question_leaderboard(quiz_id, question_id):
     """
     API: Get question leaderboard for a specific question
     """
-    quiz = Quiz.query.get(quiz_id)
-    question = Question.query.get(question_id)
-    
-    if not quiz or not quiz.show_leaderboard_global or (question and not question.show_leaderboard):
+    if not LeaderboardService.is_enabled(quiz_id, question_id):
         return jsonify({
             'quiz_id': quiz_id,
             'question_id': question_id,
@@ -620,16 +635,19 @@ def api_question_leaderboard(quiz_id, question_id):
             'message': 'Leaderboard disabled'
         })
     
-    leaderboard_data = LeaderboardService.get_question_leaderboard(quiz_id, question_id)
+    # Paged via ?limit=&offset= (top 10 by default, at most 50 per page)
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 50)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    leaderboard_data = LeaderboardService.get_question_leaderboard(
+        quiz_id, question_id, limit=limit, offset=offset
+    )
     
     # Add metadata to each entry
     for entry in leaderboard_data:
         entry['quiz_id'] = quiz_id
         entry['question_id'] = question_id
     
-    print(f'API Question Leaderboard: {len(leaderboard_data)} entries')
-    
-    return jsonify({
+    return polled_json_response({
         'quiz_id': quiz_id,
         'question_id': question_id,
         'participants': len(leaderboard_data),
@@ -640,10 +658,10 @@ def api_question_leaderboard(quiz_id, question_id):
 @student_bp.route('/api/quiz-status/<int:quiz_id>')
 def api_quiz_status(quiz_id):
     """API: Get current quiz status (for leaderboard auto-refresh)"""
-    quiz = Quiz.query.get_or_404(quiz_id)
+    quiz = db.get_or_404(Quiz, quiz_id)
     
-    current_index = quiz_state.get(quiz_id, {}).get('current_qindex', 0)
-    total_questions = Question.query.filter_by(quiz_id=quiz_id).count()
+    current_index = QuizStateService.get(quiz_id).get('current_qindex', 0)
+    total_questions = Question.count_for_quiz(quiz_id)
     
     return jsonify({
         'quiz_id': quiz_id,
@@ -662,19 +680,12 @@ def api_my_stats(quiz_id):
     """API: Get current student's stats for this quiz"""
     student_name = get_student_name()
     
-    partials = PartialAnswer.query.filter_by(
-        quiz_id=quiz_id,
-        student=student_name
-    ).all()
-    
-    total_points = sum(p.points for p in partials)
-    correct_count = sum(1 for p in partials if p.is_correct)
-    total_answered = len(partials)
+    totals = ScoringService.student_totals(quiz_id, student_name)
     
     return jsonify({
         'student': student_name,
-        'total_points': total_points,
-        'correct_count': correct_count,
-        'total_answered': total_answered,
+        'total_points': totals.total_points,
+        'correct_count': totals.correct,
+        'total_answered': totals.answered,
         'rank': 0  # Will be calculated on frontend
     })
\ No newline at end of file
@@ -3,5 +3,10 @@ Services Package
 """
 from app.services.scoring_service import ScoringService
 from app.services.leaderboard_service import LeaderboardService
+from app.services.quiz_state_service import QuizStateService
+from app.services.dashboard_service import DashboardService
+from app.services.participant_service import ParticipantService
+from app.services.published_quiz_service import PublishedQuizService
 
-__all__ = ['ScoringService', 'LeaderboardService']
\ No newline at end of file
+__all__ = ['ScoringService', 'LeaderboardService', 'QuizStateService', 'DashboardService', 'ParticipantService',
+           'PublishedQuizService']
\ No newline at end of file
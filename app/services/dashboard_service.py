@@ -0,0 +1,102 @@
+"""
+Dashboard Service
+Admin dashboard counters, cached between quiz lifecycle events
+Routes that change the counted rows call invalidate(); the TTL is only a
+safety net for writes that bypass them
+"""
+import os
+from cachetools import TTLCache
+from sqlalchemy import func
+from app import extensions
+from app.extensions import db
+from app.models import Quiz, User, Result
+
+DASHBOARD_STATS_TTL = int(os.getenv("DASHBOARD_STATS_TTL", 300))
+
+# Above this many rows an exact COUNT(*) is replaced by the planner estimate
+APPROX_COUNT_MIN_ROWS = int(os.getenv("APPROX_COUNT_MIN_ROWS", 100000))
+
+_CACHE_KEY = 'dashboard:stats'
+_stats_cache = TTLCache(maxsize=1, ttl=DASHBOARD_STATS_TTL)
+
+
+class DashboardService:
+    """Admin dashboard counters"""
+
+    @staticmethod
+    def approx_count(table_name):
+        """
+        Planner row estimate for a whole table (PostgreSQL only)
+
+        Returns:
+            int or None: Estimate, or None when unavailable / not analyzed yet
+        """
+        if db.engine.dialect.name != 'postgresql':
+            return None
+        estimate = db.session.execute(
+            db.text("SELECT reltuples::bigint FROM pg_class WHERE relname = :name"),
+            {'name': table_name}
+        ).scalar()
+        # reltuples is -1 until the table has been vacuumed/analyzed
+        return estimate if estimate is not None and estimate >= 0 else None
+
+    @staticmethod
+    def compute_counters():
+        """Count quizzes, active quizzes, students and results in one query"""
+        # Result grows with every submission; a ~1% estimate is fine once large.
+        # (total_students filters on role, so it always needs a real COUNT.)
+        approx_responses = DashboardService.approx_count(Result.__tablename__)
+        if approx_responses is not None and approx_responses >= APPROX_COUNT_MIN_ROWS:
+            responses_count = db.literal(approx_responses)
+        else:
+            responses_count = db.session.query(func.count(Result.id)).scalar_subquery()
+
+        total_quizzes, active_quizzes, total_students, total_responses = db.session.query(
+            db.session.query(func.count(Quiz.id)).scalar_subquery(),
+            db.session.query(func.count(Quiz.id)).filter(Quiz.is_active == True).scalar_subquery(),
+            db.session.query(func.count(User.id)).filter(User.role == 'student').scalar_subquery(),
+            responses_count
+        ).one()
+
+        return {
+            'total_quizzes': total_quizzes,
+            'active_quizzes': active_quizzes,
+            'total_students': total_students,
+            'total_responses': total_responses,
+        }
+
+    @staticmethod
+    def get_counters():
+        """
+        Get dashboard counters, recomputing only after invalidate() or TTL
+
+        Returns:
+            dict: total_quizzes, active_quizzes, total_students, total_responses
+        """
+        redis_client = extensions.redis_client
+        if redis_client is None:
+            counters = _stats_cache.get(_CACHE_KEY)
+            if counters is None:
+                counters = _stats_cache[_CACHE_KEY] = DashboardService.compute_counters()
+            return counters
+
+        raw = redis_client.hgetall(_CACHE_KEY)
+        if raw:
+            return {name: int(value) for name, value in raw.items()}
+
+        counters = DashboardService.compute_counters()
+        pipe = redis_client.pipeline()
+        pipe.hset(_CACHE_KEY, mapping=counters)
+        pipe.expire(_CACHE_KEY, DASHBOARD_STATS_TTL)
+        pipe.execute()
+        return counters
+
+    @staticmethod
+    def invalidate():
+        """Drop cached counters (call after committing a counted change)"""
+        redis_client = extensions.redis_client
+        if redis_client is None:
+            _stats_cache.pop(_CACHE_KEY, None)
+            return
+
+        redis_client.delete(_CACHE_KEY)
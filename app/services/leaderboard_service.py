@@ -1,48 +1,157 @@
 """
 Leaderboard Service
 Handles leaderboard generation and queries
+Full quiz payloads are cached for a few seconds so polling clients share
+one aggregate query; answer submissions call invalidate()
 """
-from app.extensions import db
-from app.models import PartialAnswer, Question
-from sqlalchemy import func
+import os
+from cachetools import TTLCache
+from app import extensions
+from app.extensions import db, SocketJSON
+from app.models import PartialAnswer, Question, Quiz
+from sqlalchemy import bindparam, func, select
+
+LEADERBOARD_CACHE_TTL = int(os.getenv("LEADERBOARD_CACHE_TTL", 3))
+
+# Payloads are stored serialized so callers can't mutate the cached copy
+_payload_cache = TTLCache(maxsize=256, ttl=LEADERBOARD_CACHE_TTL)
+
+
+def _cache_key(quiz_id):
+    return f'lb:{quiz_id}'
+
+
+# Hot statements are built once so SQLAlchemy's compiled cache is hit on
+# every call; values go in as bind parameters
+_total_points = func.sum(PartialAnswer.points)
+_correct_count = func.sum(db.case((PartialAnswer.is_correct == True, 1), else_=0))
+_total_time = func.sum(PartialAnswer.time_taken)
+# Standings order: most points, then most correct, then least total time
+# (name last so full ties keep a stable rank between polls)
+_rank = func.row_number().over(order_by=(
+    _total_points.desc(), _correct_count.desc(), _total_time.asc(),
+    PartialAnswer.student.asc()
+))
+
+_PAYLOAD_STMT = select(
+    PartialAnswer.student,
+    _total_points.label("total_points"),
+    _correct_count.label("correct_count"),
+    func.sum(
+        db.case((PartialAnswer.is_correct == False, 1), else_=0)
+    ).label("incorrect_count"),
+    _total_time.label("total_time"),
+    _rank.label("rank"),
+    # Question count rides along as a scalar subquery (one round-trip)
+    select(func.count(Question.id))
+        .where(Question.quiz_id == bindparam('quiz_id'))
+        .scalar_subquery().label("total_questions"),
+).where(
+    PartialAnswer.quiz_id == bindparam('quiz_id')
+# Ranked in SQL, so rows arrive in standings order with no Python sort
+).group_by(PartialAnswer.student).order_by(_rank).execution_options(yield_per=500)
+
+_QUESTION_CORRECT = select(
+    PartialAnswer.student, PartialAnswer.time_taken, PartialAnswer.points
+).where(
+    PartialAnswer.quiz_id == bindparam('quiz_id'),
+    PartialAnswer.question_id == bindparam('question_id'),
+    PartialAnswer.is_correct == True
+)
+# Page size and start are bound too, so every page shares one compiled form
+_QUESTION_FASTEST = _QUESTION_CORRECT.order_by(
+    PartialAnswer.time_taken.asc(), PartialAnswer.submitted_at.asc()
+).limit(bindparam('limit')).offset(bindparam('offset'))
+_QUESTION_FIRST = _QUESTION_CORRECT.order_by(
+    PartialAnswer.submitted_at.asc()
+).limit(bindparam('limit')).offset(bindparam('offset'))
 
 
 class LeaderboardService:
     """Leaderboard generation and management"""
     
     @staticmethod
-    def build_leaderboard_payload(quiz_id):
+    def is_enabled(quiz_id, question_id=None):
+        """
+        Check the quiz (and optionally question) leaderboard switches
+        Selects just the flags instead of loading the Quiz/Question rows;
+        a missing question falls back to the quiz setting
         """
-        Build full leaderboard payload for a quiz
+        query = db.session.query(Quiz.leaderboard_on)
+        if question_id is not None:
+            query = query.add_columns(Question.id, Question.show_leaderboard)\
+                .outerjoin(Question, Question.id == question_id)
+        flags = query.filter(Quiz.id == quiz_id).first()
+        if not flags or not flags[0]:
+            return False
+        return question_id is None or flags[1] is None or bool(flags[2])
+    
+    @staticmethod
+    def build_leaderboard_payload(quiz_id, limit=None):
+        """
+        Build leaderboard payload for a quiz (cached, see invalidate())
+        
+        Args:
+            limit: Return only the top N entries (None = everyone)
         
         Returns:
-            list: List of dicts with student, points, correct, incorrect, time, total
+            dict: total_questions, plus entries - list of dicts with rank,
+            quiz_id, student, points, correct, incorrect, time; best first
         """
-        total_questions = Question.query.filter_by(quiz_id=quiz_id).count()
+        key = _cache_key(quiz_id)
+        redis_client = extensions.redis_client
+        cached = redis_client.get(key) if redis_client is not None else _payload_cache.get(key)
+        if cached is not None:
+            payload = SocketJSON.loads(cached)
+        else:
+            payload = LeaderboardService.compute_leaderboard_payload(quiz_id)
+            serialized = SocketJSON.dumps(payload)
+            if redis_client is not None:
+                redis_client.setex(key, LEADERBOARD_CACHE_TTL, serialized)
+            else:
+                _payload_cache[key] = serialized
         
-        rows = db.session.query(
-            PartialAnswer.student,
-            func.sum(PartialAnswer.points).label("total_points"),
-            func.sum(
-                db.case((PartialAnswer.is_correct == True, 1), else_=0)
-            ).label("correct_count"),
-            func.sum(
-                db.case((PartialAnswer.is_correct == False, 1), else_=0)
-            ).label("incorrect_count"),
-            func.sum(PartialAnswer.time_taken).label("total_time"),
-        ).filter_by(quiz_id=quiz_id).group_by(PartialAnswer.student).all()
+        # One cached standings list per quiz; top-N views slice it
+        if limit is not None:
+            payload['entries'] = payload['entries'][:limit]
+        return payload
+    
+    @staticmethod
+    def compute_leaderboard_payload(quiz_id):
+        """Run the leaderboard aggregate for a quiz (uncached)"""
+        rows = db.session.execute(_PAYLOAD_STMT, {'quiz_id': quiz_id})
         
-        return [
-            {
+        # SUMs over integer columns already come back as ints; only NULL needs a default
+        entries = []
+        total = None
+        for row in rows:
+            total = row.total_questions
+            entries.append({
+                "rank": row.rank,
+                "quiz_id": quiz_id,
                 "student": row.student,
-                "points": int(row.total_points or 0),
-                "correct": int(row.correct_count or 0),
-                "incorrect": int(row.incorrect_count or 0),
-                "time": int(row.total_time or 0),
-                "total": total_questions,
-            }
-            for row in rows
-        ]
+                "points": row.total_points or 0,
+                "correct": row.correct_count or 0,
+                "incorrect": row.incorrect_count or 0,
+                "time": row.total_time or 0,
+            })
+        
+        # Same for every student, so it is sent once rather than per entry
+        if total is None:
+            total = Question.count_for_quiz(quiz_id)
+        
+        return {"total_questions": total, "entries": entries}
+    
+    @staticmethod
+    def invalidate(quiz_id):
+        """Drop the cached payload (call after committing answer changes)"""
+        key = _cache_key(quiz_id)
+        redis_client = extensions.redis_client
+        if redis_client is None:
+            _payload_cache.pop(key, None)
+            return
+        
+        redis_client.delete(key)
     
     @staticmethod
     def get_leaderboard_data(quiz_id):
@@ -57,35 +166,28 @@ class LeaderboardService:
         return [{"name": r.name, "score": int(r.score)} for r in points_query]
     
     @staticmethod
-    def get_question_leaderboard(quiz_id, question_id):
-        """Get leaderboard for a specific question"""
-        from app.models import Quiz
+    def get_question_leaderboard(quiz_id, question_id, limit=10, offset=0):
+        """
+        Get leaderboard for a specific question
         
-        quiz = Quiz.query.get(quiz_id)
-        if not quiz:
+        Args:
+            limit: Page size (defaults to the top 10)
+            offset: Entries to skip; ranks stay global across pages
+        """
+        flags = db.session.query(Quiz.has_timer).filter(Quiz.id == quiz_id).first()
+        if not flags:
             return []
         
-        if quiz.has_timer:
-            answers = PartialAnswer.query.filter_by(
-                quiz_id=quiz_id,
-                question_id=question_id,
-                is_correct=True
-            ).order_by(
-                PartialAnswer.time_taken.asc(),
-                PartialAnswer.submitted_at.asc()
-            ).limit(10).all()
-        else:
-            answers = PartialAnswer.query.filter_by(
-                quiz_id=quiz_id,
-                question_id=question_id,
-                is_correct=True
-            ).order_by(
-                PartialAnswer.submitted_at.asc()
-            ).limit(10).all()
+        # Timed quizzes rank by speed, untimed ones by who answered first
+        stmt = _QUESTION_FASTEST if flags.has_timer else _QUESTION_FIRST
+        answers = db.session.execute(
+            stmt, {'quiz_id': quiz_id, 'question_id': question_id,
+                   'limit': limit, 'offset': offset}
+        ).all()
         
         return [
             {
-                "rank": i + 1,
+                "rank": offset + i + 1,
                 "student": a.student,
                 "time_taken": a.time_taken,
                 "points": a.points
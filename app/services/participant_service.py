@@ -0,0 +1,170 @@
+"""
+Participant Service
+Waiting-room names and connected sockets per quiz
+Redis is used when REDIS_URL is set so every worker sees the same rooms;
+otherwise they live in the per-worker TTL caches from app.extensions
+Sockets are indexed by sid, so join/leave/disconnect never scan a room
+"""
+from collections import Counter
+from app import extensions
+from app.extensions import (
+    waiting_rooms, active_participants, participant_name_counts, participant_sockets, QUIZ_STATE_TTL
+)
+
+
+def _waiting_key(quiz_id):
+    return f'quiz:{quiz_id}:waiting'
+
+
+def _participants_key(quiz_id):
+    return f'quiz:{quiz_id}:participants'
+
+
+def _sid_key(sid):
+    return f'sid:{sid}:quiz'
+
+
+def _drop_local_socket(quiz_id, sid):
+    """Forget a socket in the per-worker maps, keeping name counts in step"""
+    username = active_participants.get(quiz_id, {}).pop(sid, None)
+    counts = participant_name_counts.get(quiz_id)
+    if username is None or counts is None:
+        return
+    counts[username] -= 1
+    if counts[username] <= 0:
+        del counts[username]
+
+
+class ParticipantService:
+    """Track who is waiting in / connected to a quiz"""
+
+    @staticmethod
+    def join(quiz_id, sid, username):
+        """
+        Add a user to the waiting room and register their socket
+
+        Returns:
+            list: Waiting-room usernames after the join (sorted)
+        """
+        redis_client = extensions.redis_client
+        if redis_client is None:
+            users = waiting_rooms.get(quiz_id) or set()
+            sockets = active_participants.get(quiz_id) or {}
+            counts = participant_name_counts.get(quiz_id) or Counter()
+            users.add(username)
+            if sockets.get(sid) != username:
+                _drop_local_socket(quiz_id, sid)
+                sockets[sid] = username
+                counts[username] += 1
+            # Re-insert so the TTL restarts on activity
+            waiting_rooms[quiz_id] = users
+            active_participants[quiz_id] = sockets
+            participant_name_counts[quiz_id] = counts
+            participant_sockets[sid] = (quiz_id, username)
+            return sorted(users)
+
+        waiting_key = _waiting_key(quiz_id)
+        participants_key = _participants_key(quiz_id)
+        # Writes and the member list in one round trip (no MULTI needed)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.sadd(waiting_key, username)
+        pipe.hset(participants_key, sid, username)
+        # quiz ids are numeric, so the first ':' splits this back apart
+        pipe.set(_sid_key(sid), f'{quiz_id}:{username}', ex=QUIZ_STATE_TTL)
+        pipe.expire(waiting_key, QUIZ_STATE_TTL)
+        pipe.expire(participants_key, QUIZ_STATE_TTL)
+        pipe.smembers(waiting_key)
+        return sorted(pipe.execute()[-1])
+
+    @staticmethod
+    def leave(quiz_id, sid, username):
+        """
+        Remove a user from the waiting room and drop the leaving socket
+
+        Returns:
+            bool: True if the user was in the waiting room
+        """
+        redis_client = extensions.redis_client
+        if redis_client is None:
+            participant_sockets.pop(sid, None)
+            _drop_local_socket(quiz_id, sid)
+            users = waiting_rooms.get(quiz_id)
+            if not users or username not in users:
+                return False
+            users.discard(username)
+            return True
+
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hdel(_participants_key(quiz_id), sid)
+        pipe.delete(_sid_key(sid))
+        pipe.srem(_waiting_key(quiz_id), username)
+        return bool(pipe.execute()[-1])
+
+    @staticmethod
+    def disconnect(sid):
+        """
+        Forget a socket and take its user out of the waiting room
+
+        Returns:
+            tuple or None: (quiz_id, username removed from the waiting room
+            or None), None when the socket never joined a quiz
+        """
+        redis_client = extensions.redis_client
+        if redis_client is None:
+            entry = participant_sockets.pop(sid, None)
+            if entry is None:
+                return None
+            quiz_id, username = entry
+            _drop_local_socket(quiz_id, sid)
+            users = waiting_rooms.get(quiz_id)
+            if not users or username not in users:
+                return quiz_id, None
+            users.discard(username)
+            return quiz_id, username
+
+        entry = redis_client.get(_sid_key(sid))
+        if entry is None:
+            return None
+        quiz_id, _, username = entry.partition(':')
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.hdel(_participants_key(quiz_id), sid)
+        pipe.delete(_sid_key(sid))
+        pipe.srem(_waiting_key(quiz_id), username)
+        return quiz_id, username if pipe.execute()[-1] else None
+
+    @staticmethod
+    def waiting_users(quiz_id):
+        """
+        Usernames currently in a quiz's waiting room
+
+        Returns:
+            list: Usernames (sorted)
+        """
+        redis_client = extensions.redis_client
+        if redis_client is None:
+            return sorted(waiting_rooms.get(quiz_id, ()))
+
+        return sorted(redis_client.smembers(_waiting_key(quiz_id)))
+
+    @staticmethod
+    def waiting_count(quiz_id):
+        """Number of users in a quiz's waiting room"""
+        redis_client = extensions.redis_client
+        if redis_client is None:
+            return len(waiting_rooms.get(quiz_id, ()))
+
+        return redis_client.scard(_waiting_key(quiz_id))
+
+    @staticmethod
+    def participant_names(quiz_id):
+        """
+        Unique names of the sockets connected to a quiz
+
+        Returns:
+            list: Usernames (sorted)
+        """
+        redis_client = extensions.redis_client
+        if redis_client is None:
+            return sorted(participant_name_counts.get(quiz_id, ()))
+
+        return sorted(set(redis_client.hvals(_participants_key(quiz_id))))
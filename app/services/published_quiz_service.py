@@ -0,0 +1,67 @@
+"""
+Published Quiz Service
+Join-code lookups and the student quiz listing, cached per worker
+With Redis, invalidate() bumps a shared version that every worker's cache
+keys on, so a publish/stop/delete on one worker reaches all of them
+"""
+from cachetools.func import ttl_cache
+from sqlalchemy import func
+from app import extensions
+from app.extensions import db
+from app.models import Quiz, Question
+
+_VERSION_KEY = 'published_quizzes:version'
+
+
+def _published_version():
+    """Current published-quiz generation (0 without Redis)"""
+    redis_client = extensions.redis_client
+    if redis_client is None:
+        return 0
+    return redis_client.get(_VERSION_KEY) or 0
+
+
+@ttl_cache(maxsize=4096, ttl=30)
+def _join_code_quiz_id(code, version):
+    return db.session.execute(
+        db.select(Quiz.id).filter_by(join_code=code, is_published=True)
+    ).scalar()
+
+
+@ttl_cache(maxsize=1, ttl=10)
+def _published_quiz_rows(version):
+    question_count = db.select(func.count(Question.id))\
+        .where(Question.quiz_id == Quiz.id).scalar_subquery()
+    return tuple(db.session.execute(
+        db.select(
+            Quiz.id, Quiz.title, Quiz.join_code, Quiz.has_timer, Quiz.is_active,
+            question_count.label('question_count')
+        ).filter_by(is_published=True).order_by(Quiz.published_at.desc())
+    ).all())
+
+
+class PublishedQuizService:
+    """Cached reads of published quizzes"""
+
+    @staticmethod
+    def resolve_join_code(code):
+        """Map a join code to its published quiz id (None if there isn't one)"""
+        return _join_code_quiz_id(code, _published_version())
+
+    @staticmethod
+    def listing():
+        """Published quizzes for the student listing, newest first, as plain rows"""
+        return _published_quiz_rows(_published_version())
+
+    @staticmethod
+    def invalidate():
+        """
+        Drop cached published-quiz lookups (call after publish/start/stop/delete)
+        Clears this worker's caches; with Redis, bumping the shared version
+        makes every other worker miss on its next lookup
+        """
+        _join_code_quiz_id.cache_clear()
+        _published_quiz_rows.cache_clear()
+        redis_client = extensions.redis_client
+        if redis_client is not None:
+            redis_client.incr(_VERSION_KEY)
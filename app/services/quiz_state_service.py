@@ -0,0 +1,166 @@
+"""
+Quiz State Service
+Live quiz progress (current question, timers) shared by routes and sockets
+Redis is used when REDIS_URL is set so every worker sees the same state;
+otherwise state lives in the per-worker TTL cache from app.extensions
+"""
+from app import extensions
+from app.extensions import quiz_state, QUIZ_STATE_TTL
+
+# Redis hashes hold strings - restore Python types on read
+_FIELD_TYPES = {
+    'current_qindex': int,
+    'started_at': float,
+    'overall_timer': int,
+    'overall_started_at': float,
+    'total_questions': int,
+}
+
+
+def _redis_key(quiz_id):
+    return f'quiz:{quiz_id}:state'
+
+
+# Check-and-advance in one server-side step: returns the new index, or -1
+# when already on the last question (the index is then left untouched)
+_ADVANCE_WITHIN_LUA = """
+local current = tonumber(redis.call('HGET', KEYS[1], 'current_qindex') or '0')
+if current >= tonumber(ARGV[1]) - 1 then
+    return -1
+end
+local new_qindex = redis.call('HINCRBY', KEYS[1], 'current_qindex', 1)
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return new_qindex
+"""
+_advance_within_script = None
+
+# Same for going back: returns the new index, or -1 when already on the
+# first question
+_STEP_BACK_LUA = """
+local current = tonumber(redis.call('HGET', KEYS[1], 'current_qindex') or '0')
+if current <= 0 then
+    return -1
+end
+local new_qindex = redis.call('HINCRBY', KEYS[1], 'current_qindex', -1)
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return new_qindex
+"""
+_step_back_script = None
+
+
+class QuizStateService:
+    """Read and write live quiz state"""
+    
+    @staticmethod
+    def get(quiz_id):
+        """
+        Get state for a quiz
+        
+        Returns:
+            dict: State fields, empty when the quiz has no live state
+        """
+        redis_client = extensions.redis_client
+        if redis_client is None:
+            return quiz_state.get(quiz_id, {})
+        
+        raw = redis_client.hgetall(_redis_key(quiz_id))
+        return {
+            field: _FIELD_TYPES.get(field, str)(value)
+            for field, value in raw.items()
+        }
+    
+    @staticmethod
+    def set(quiz_id, state):
+        """Replace the whole state for a quiz"""
+        redis_client = extensions.redis_client
+        if redis_client is None:
+            quiz_state[quiz_id] = dict(state)
+            return
+        
+        key = _redis_key(quiz_id)
+        pipe = redis_client.pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping=state)
+        pipe.expire(key, QUIZ_STATE_TTL)
+        pipe.execute()
+    
+    @staticmethod
+    def update(quiz_id, **fields):
+        """Set individual state fields, keeping the others"""
+        redis_client = extensions.redis_client
+        if redis_client is None:
+            # Re-insert so the TTL restarts on activity
+            quiz_state[quiz_id] = {**quiz_state.get(quiz_id, {}), **fields}
+            return
+        
+        key = _redis_key(quiz_id)
+        pipe = redis_client.pipeline()
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, QUIZ_STATE_TTL)
+        pipe.execute()
+    
+    @staticmethod
+    def advance_within(quiz_id, total_questions):
+        """
+        Move to the next question unless already on the last one
+        Atomic on Redis (Lua script), so concurrent clicks can neither skip
+        a question nor push the index past the end
+        
+        Returns:
+            int or None: The new question index, None when the quiz is finished
+        """
+        global _advance_within_script
+        redis_client = extensions.redis_client
+        if redis_client is None:
+            state = quiz_state.get(quiz_id, {})
+            current = state.get('current_qindex', 0)
+            if current >= total_questions - 1:
+                return None
+            quiz_state[quiz_id] = {**state, 'current_qindex': current + 1}
+            return current + 1
+        
+        if _advance_within_script is None:
+            # Script objects run EVALSHA and reload on NOSCRIPT by themselves
+            _advance_within_script = redis_client.register_script(_ADVANCE_WITHIN_LUA)
+        new_qindex = _advance_within_script(
+            keys=[_redis_key(quiz_id)],
+            args=[total_questions, QUIZ_STATE_TTL]
+        )
+        return None if new_qindex < 0 else new_qindex
+    
+    @staticmethod
+    def step_back(quiz_id):
+        """
+        Move to the previous question unless already on the first one
+        Atomic on Redis (Lua script), so the index never goes below 0
+        
+        Returns:
+            int or None: The new question index, None when already at 0
+        """
+        global _step_back_script
+        redis_client = extensions.redis_client
+        if redis_client is None:
+            state = quiz_state.get(quiz_id, {})
+            current = state.get('current_qindex', 0)
+            if current <= 0:
+                return None
+            quiz_state[quiz_id] = {**state, 'current_qindex': current - 1}
+            return current - 1
+        
+        if _step_back_script is None:
+            _step_back_script = redis_client.register_script(_STEP_BACK_LUA)
+        new_qindex = _step_back_script(
+            keys=[_redis_key(quiz_id)],
+            args=[QUIZ_STATE_TTL]
+        )
+        return None if new_qindex < 0 else new_qindex
+    
+    @staticmethod
+    def clear(quiz_id):
+        """Drop all state for a quiz"""
+        redis_client = extensions.redis_client
+        if redis_client is None:
+            quiz_state.pop(quiz_id, None)
+            return
+        
+        redis_client.delete(_redis_key(quiz_id))
@@ -4,8 +4,12 @@ ENHANCED: Support for different question types
 """
 from app.extensions import db
 from app.models import PartialAnswer, Question
+from sqlalchemy import func, select, update
 import math
 
+# Bonus points for the fastest correct answers: 1st +3, 2nd +2, 3rd +1
+RANK_BONUSES = (3, 2, 1)
+
 
 class ScoringService:
     """Service for scoring answers"""
@@ -45,27 +49,47 @@ class ScoringService:
         
         return base_points
     
+    @staticmethod
+    def student_totals(quiz_id, student):
+        """
+        Aggregate a student's answers for a quiz in SQL (one row back)
+        
+        Returns:
+            Row: correct, total_time, total_points, answered (0 when no answers)
+        """
+        return db.session.query(
+            func.coalesce(func.sum(db.case((PartialAnswer.is_correct == True, 1), else_=0)), 0).label('correct'),
+            func.coalesce(func.sum(PartialAnswer.time_taken), 0).label('total_time'),
+            func.coalesce(func.sum(PartialAnswer.points), 0).label('total_points'),
+            func.count(PartialAnswer.id).label('answered')
+        ).filter(
+            PartialAnswer.quiz_id == quiz_id,
+            PartialAnswer.student == student
+        ).one()
+    
     @staticmethod
     def update_question_rank_bonuses(quiz_id, question_id):
         """
         Award bonus points for fastest correct answers
+        Changes are flushed, not committed; the caller owns the transaction
         """
-        # Get all correct answers for this question, ordered by time
-        correct_answers = PartialAnswer.query.filter_by(
-            quiz_id=quiz_id,
-            question_id=question_id,
-            is_correct=True
-        ).order_by(PartialAnswer.time_taken).all()
-        
-        # Award bonus points to top 3 fastest
-        bonus_points = [3, 2, 1]  # 1st: +3, 2nd: +2, 3rd: +1
-        
-        for idx, answer in enumerate(correct_answers[:3]):
-            bonus = bonus_points[idx]
-            
-            # Update points with bonus
-            answer.points += bonus
-            
-            print(f"🏆 Bonus: {answer.student} +{bonus} points (Rank #{idx+1})")
+        # Rank correct answers for this question by time...
+        ranked = select(
+            PartialAnswer.id,
+            func.row_number().over(order_by=PartialAnswer.time_taken).label('rn')
+        ).where(
+            PartialAnswer.quiz_id == quiz_id,
+            PartialAnswer.question_id == question_id,
+            PartialAnswer.is_correct == True
+        ).cte('ranked')
         
-        db.session.commit()
\ No newline at end of file
+        # ...and add the top ranks' bonuses in one UPDATE ... FROM
+        bonus = db.case(
+            *((ranked.c.rn == rank, points) for rank, points in enumerate(RANK_BONUSES, 1))
+        )
+        db.session.execute(
+            update(PartialAnswer)
+            .where(PartialAnswer.id == ranked.c.id, ranked.c.rn <= len(RANK_BONUSES))
+            .values(points=PartialAnswer.points + bonus)
+            .execution_options(synchronize_session=False)
+        )
\ No newline at end of file
@@ -2,52 +2,69 @@
 Socket.IO Event Handlers
 Real-time quiz events and leaderboard updates
 """
-from flask import session, request
+import os
+import threading
+from flask import session, request, current_app
 from flask_socketio import emit, join_room, leave_room
-from app.extensions import socketio, quiz_state, active_participants
+from app.extensions import socketio
 from app.models import Question
+from app.services import QuizStateService, ParticipantService
 
-# Store waiting room participants
-waiting_rooms = {}
+# Participant updates go out at most once per interval per room, so a join
+# storm sends one message per room instead of one per join
+PARTICIPANT_FLUSH_INTERVAL = float(os.getenv("PARTICIPANT_FLUSH_INTERVAL", 0.1))
+
+# quiz_id -> {'added': set, 'removed': set}: unsent waiting-room changes
+_waiting_deltas = {}
+# quiz ids whose connected-participant list changed
+_dirty_quizzes = set()
+_dirty_lock = threading.Lock()
 
 def register_socket_events():
     """Register all Socket.IO event handlers"""
+    # Bound once, so room joins skip flask_socketio's per-call proxy lookups
+    server = socketio.server
     
     @socketio.on('join_quiz')
     def join_quiz(data):
         """Student joins a quiz room"""
         quiz_id = str(data['quiz_id'])
         join_room(quiz_id)
-        print(f'✅ User joined room: quiz_{quiz_id}')
+        current_app.logger.debug('User joined room: quiz_%s', quiz_id)
     
     @socketio.on('admin_next_question')
     def admin_next_question(data):
         """Admin advances to next question"""
         quiz_id = int(data['quiz_id'])
         
-        if quiz_id not in quiz_state:
-            quiz_state[quiz_id] = {'current_qindex': 0}
+        state = QuizStateService.get(quiz_id)
         
-        total_questions = Question.query.filter_by(quiz_id=quiz_id).count()
-        current_index = quiz_state[quiz_id]['current_qindex']
+        # start_quiz stores the count; if the state expired or predates
+        # that, count once and keep it for the following clicks
+        total_questions = state.get('total_questions')
+        if total_questions is None:
+            total_questions = Question.count_for_quiz(quiz_id)
+            QuizStateService.update(
+                quiz_id,
+                current_qindex=state.get('current_qindex', 0),
+                total_questions=total_questions
+            )
         
-        print(f'🎯 Current question: {current_index + 1} of {total_questions}')
+        # Check and advance in one atomic step, so a double click at the
+        # last question can't overshoot (nor briefly expose index == total)
+        new_qindex = QuizStateService.advance_within(quiz_id, total_questions)
         
-        if current_index >= total_questions - 1:
-            print('🏁 Quiz finished - emitting quiz_finished event')
+        if new_qindex is None:
+            current_app.logger.debug('Quiz %s finished - emitting quiz_finished', quiz_id)
             socketio.emit('quiz_finished', {}, room=str(quiz_id))
             return
         
-        quiz_state[quiz_id]['current_qindex'] += 1
-        new_qindex = quiz_state[quiz_id]['current_qindex']
-        
-        print(f'📤 Moving to question {new_qindex + 1} of {total_questions}')
+        current_app.logger.debug('Quiz %s: moving to question %s of %s', quiz_id, new_qindex + 1, total_questions)
         socketio.emit(
             'load_next_question',
             {'qindex': new_qindex, 'quiz_id': quiz_id},
             room=str(quiz_id)
         )
-        print(f'📡 Emitted load_next_question with qindex={new_qindex} to room {quiz_id}')
     
     @socketio.on('join_waiting_room')
     def handle_join_waiting_room(data):
@@ -55,29 +72,19 @@ def register_socket_events():
         quiz_id = str(data.get('quiz_id'))
         username = data.get('username') or session.get('username') or f"Guest-{session.get('guest_id', '00000000')}"
         
-        # Create waiting room if it doesn't exist
-        if quiz_id not in waiting_rooms:
-            waiting_rooms[quiz_id] = []
+        sid = request.sid
+        namespace = request.namespace
         
-        # Add user if not already there
-        if username not in waiting_rooms[quiz_id]:
-            waiting_rooms[quiz_id].append(username)
-            print(f'👤 {username} joined waiting room for quiz {quiz_id}')
+        # Shared across workers when Redis is configured
+        users = ParticipantService.join(quiz_id, sid, username)
         
-        # Join the socket room for this waiting room
-        join_room(f'waiting_room_{quiz_id}')
-        
-        # Broadcast updated participant list to everyone in waiting room
-        emit('update_participants', {
-            'users': waiting_rooms[quiz_id],
-            'count': len(waiting_rooms[quiz_id])
-        }, room=f'waiting_room_{quiz_id}')
+        # Join the socket room for this waiting room, and the main quiz room too
+        for room in (f'waiting_room_{quiz_id}', quiz_id):
+            server.enter_room(sid, room, namespace=namespace)
         
-        # Also update active participants for the main quiz room
-        join_room(quiz_id)  # Join main quiz room too
-        if quiz_id not in active_participants:
-            active_participants[quiz_id] = {}
-        active_participants[quiz_id][request.sid] = username
+        # Full list to the joiner only; the room just gets the new name
+        emit('update_participants', {'users': users, 'count': len(users)})
+        queue_waiting_room_change(quiz_id, added=username)
     
     @socketio.on('leave_waiting_room')
     def handle_leave_waiting_room(data):
@@ -85,51 +92,72 @@ def register_socket_events():
         quiz_id = str(data.get('quiz_id'))
         username = data.get('username') or session.get('username') or f"Guest-{session.get('guest_id', '00000000')}"
         
-        if quiz_id in waiting_rooms and username in waiting_rooms[quiz_id]:
-            waiting_rooms[quiz_id].remove(username)
-            print(f'👤 {username} left waiting room for quiz {quiz_id}')
+        if ParticipantService.leave(quiz_id, request.sid, username):
+            current_app.logger.debug('%s left waiting room for quiz %s', username, quiz_id)
             
-            # Broadcast updated list
-            emit('update_participants', {
-                'users': waiting_rooms[quiz_id],
-                'count': len(waiting_rooms[quiz_id])
-            }, room=f'waiting_room_{quiz_id}')
-            
-            # Remove from active participants
-            if quiz_id in active_participants:
-                for sid, name in list(active_participants[quiz_id].items()):
-                    if name == username:
-                        del active_participants[quiz_id][sid]
-                        break
+            # Broadcast the removal
+            queue_waiting_room_change(quiz_id, removed=username)
     
     @socketio.on('disconnect')
     def handle_disconnect():
         """Handle user disconnect"""
-        # Clean up from waiting rooms
-        for quiz_id in list(waiting_rooms.keys()):
-            for username in waiting_rooms[quiz_id]:
-                if request.sid in active_participants.get(quiz_id, {}):
-                    if active_participants[quiz_id].get(request.sid) == username:
-                        waiting_rooms[quiz_id].remove(username)
-                        emit('update_participants', {
-                            'users': waiting_rooms[quiz_id],
-                            'count': len(waiting_rooms[quiz_id])
-                        }, room=f'waiting_room_{quiz_id}')
-                        break
+        left = ParticipantService.disconnect(request.sid)
+        if left is None:
+            return
+        
+        quiz_id, removed = left
+        if removed is not None:
+            queue_waiting_room_change(quiz_id, removed=removed)
         
-        # Clean up from active participants
-        for quiz_id in active_participants:
-            if request.sid in active_participants[quiz_id]:
-                del active_participants[quiz_id][request.sid]
-                emit_participant_update(quiz_id)
-                break
+        emit_participant_update(quiz_id)
 
 
 def emit_participant_update(quiz_id):
-    """Emit updated participant list"""
-    # Get unique names for the list
-    names = list(set(active_participants.get(quiz_id, {}).values()))
-    socketio.emit('update_participants', {
-        'count': len(names),
-        'users': names
-    }, room=str(quiz_id))
\ No newline at end of file
+    """Emit updated participant list (coalesced)"""
+    with _dirty_lock:
+        schedule = not (_waiting_deltas or _dirty_quizzes)
+        _dirty_quizzes.add(str(quiz_id))
+    if schedule:
+        socketio.start_background_task(_flush_participant_updates)
+
+
+def queue_waiting_room_change(quiz_id, added=None, removed=None):
+    """Queue a participants_delta broadcast for a waiting room"""
+    with _dirty_lock:
+        schedule = not (_waiting_deltas or _dirty_quizzes)
+        delta = _waiting_deltas.setdefault(str(quiz_id), {'added': set(), 'removed': set()})
+        # Later change wins, so join+leave in one window nets out
+        if added is not None:
+            delta['removed'].discard(added)
+            delta['added'].add(added)
+        if removed is not None:
+            delta['added'].discard(removed)
+            delta['removed'].add(removed)
+    if schedule:
+        socketio.start_background_task(_flush_participant_updates)
+
+
+def _flush_participant_updates():
+    """After one interval, send each changed room one message"""
+    socketio.sleep(PARTICIPANT_FLUSH_INTERVAL)
+    with _dirty_lock:
+        deltas = dict(_waiting_deltas)
+        quiz_ids = list(_dirty_quizzes)
+        _waiting_deltas.clear()
+        _dirty_quizzes.clear()
+    
+    # Waiting rooms get only the names that changed (clients keep the list)
+    for quiz_id, delta in deltas.items():
+        socketio.emit('participants_delta', {
+            'added': sorted(delta['added']),
+            'removed': sorted(delta['removed']),
+            'count': ParticipantService.waiting_count(quiz_id)
+        }, room=f'waiting_room_{quiz_id}')
+    
+    for quiz_id in quiz_ids:
+        # Unique names of connected sockets
+        users = ParticipantService.participant_names(quiz_id)
+        socketio.emit('update_participants', {
+            'users': users,
+            'count': len(users)
+        }, room=quiz_id)
\ No newline at end of file
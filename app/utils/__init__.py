@@ -5,6 +5,8 @@ from app.utils.helpers import (
     now_utc,
     utc_to_ist,
     generate_join_code,
+    strip_html_tags,
+    html_to_text,
     get_current_user,
     ensure_guest_student,
     require_admin,
@@ -15,6 +17,8 @@ __all__ = [
     'now_utc',
     'utc_to_ist',
     'generate_join_code',
+    'strip_html_tags',
+    'html_to_text',
     'get_current_user',
     'ensure_guest_student',
     'require_admin',
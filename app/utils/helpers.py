@@ -5,12 +5,24 @@ CRITICAL FIX: Decorators should not redirect guests to admin dashboard
 """
 from datetime import datetime, timezone
 from flask import session, redirect, url_for, flash
+from app.extensions import db
+# Package only: models load lazily on attribute access, so this can't cycle
+# back through app.models.question (which imports these helpers)
+from app import models
 from functools import wraps
-import random
+import secrets
 import string
 import uuid
 import pytz
 
+try:
+    # Optional: C HTML parser, regex stripping is used when missing
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# Display timezone, resolved once at import
+IST = pytz.timezone('Asia/Kolkata')
 
 def now_utc():
     """Get current UTC timestamp"""
@@ -21,22 +33,61 @@ def utc_to_ist(utc_dt):
     """Convert UTC datetime to IST for display"""
     if not utc_dt:
         return None
-    ist = pytz.timezone('Asia/Kolkata')
-    return utc_dt.replace(tzinfo=pytz.utc).astimezone(ist)
+    return utc_dt.replace(tzinfo=timezone.utc).astimezone(IST)
+
+
+def strip_html_tags(html_text):
+    """
+    Strip HTML tags from text (tags only, whitespace untouched)
+    Same result as removing every '<[^>]*>' match, but one linear pass:
+    answers are user input, and the regex goes quadratic on a run of '<'
+    with no closing '>'
+    """
+    if not html_text:
+        return ""
+    if '<' not in html_text:
+        # Plain typed answers, the common case
+        return html_text
+    parts = []
+    pos = 0
+    while True:
+        start = html_text.find('<', pos)
+        if start < 0:
+            break
+        end = html_text.find('>', start + 1)
+        if end < 0:
+            # Unclosed '<' is literal text, as is everything after it
+            break
+        parts.append(html_text[pos:start])
+        pos = end + 1
+    parts.append(html_text[pos:])
+    return ''.join(parts)
+
+
+def html_to_text(html_text):
+    """Plain text version of editor HTML for storage/search"""
+    if not html_text:
+        return ""
+    if HTMLParser is not None:
+        return HTMLParser(html_text).text(separator=" ", strip=True)
+    return strip_html_tags(html_text).strip()
+
+
+_JOIN_CODE_ALPHABET = string.ascii_uppercase + string.digits
+# OS entropy: codes are user-facing tokens and must not be predictable
+_join_code_rng = secrets.SystemRandom()
 
 
 def generate_join_code(length=6):
     """Generate random join code"""
-    return "".join(random.choices(string.ascii_uppercase + string.digits, k=length))
+    return "".join(_join_code_rng.choices(_JOIN_CODE_ALPHABET, k=length))
 
 
 def get_current_user():
     """Get current logged-in user"""
-    from app.models import User
-    
     if "user_id" not in session or session.get("user_id") == -1:
         return None
-    return User.query.get(session["user_id"])
+    return db.session.get(models.User, session["user_id"])
 
 
 def ensure_guest_student():
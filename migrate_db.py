@@ -4,12 +4,19 @@ from app.extensions import db
 import sys
 
 def migrate_database():
-    """Add missing columns to quiz and question tables (PostgreSQL Compatible)"""
+    """
+    Add missing columns to quiz and question tables
+    PostgreSQL in production; SQLite (local runs, tests) takes its own
+    branch where it lacks information_schema, JSONB or ALTER COLUMN
+    
+    Returns:
+        bool: True when the migration committed
+    """
     app = create_app()
     
     with app.app_context():
         print(f"\n{'='*50}")
-        print("DATABASE MIGRATION (PostgreSQL)")
+        print(f"DATABASE MIGRATION ({db.engine.dialect.name})")
         print(f"{'='*50}")
 
         try:
@@ -17,65 +24,229 @@ def migrate_database():
             with db.engine.connect() as connection:
                 # We use a transaction so changes are atomic
                 trans = connection.begin()
+                is_sqlite = connection.dialect.name == 'sqlite'
                 
                 # --- HELPER FUNCTION FOR POSTGRES ---
-                def get_columns(table_name):
-                    # Queries PostgreSQL information_schema instead of PRAGMA
-                    query = "SELECT column_name FROM information_schema.columns WHERE table_name = :table"
-                    result = connection.execute(db.text(query), {"table": table_name})
-                    return [row[0] for row in result.fetchall()]
+                def get_all_columns(table_names):
+                    if is_sqlite:
+                        return {
+                            table_name: {
+                                row[1] for row in connection.execute(db.text(f'PRAGMA table_info({table_name})'))
+                            }
+                            for table_name in table_names
+                        }
+                    # Queries PostgreSQL information_schema instead of PRAGMA,
+                    # every table in one round trip
+                    query = (
+                        "SELECT table_name, column_name FROM information_schema.columns "
+                        "WHERE table_name = ANY(:tables)"
+                    )
+                    result = connection.execute(db.text(query), {"tables": list(table_names)})
+                    table_columns = {table_name: set() for table_name in table_names}
+                    for table_name, column_name in result:
+                        table_columns[table_name].add(column_name)
+                    return table_columns
+
+                def add_missing_columns(table_name, columns, new_columns):
+                    # One ALTER TABLE for all missing columns: a single lock
+                    # acquisition and catalog update instead of one per column
+                    clauses = []
+                    for col_name, col_type, default_val in new_columns:
+                        if col_name in columns:
+                            print(f"  - {col_name} exists")
+                            continue
+                        # Construct clause with/without default
+                        if default_val:
+                            clauses.append(f'ADD COLUMN {col_name} {col_type} DEFAULT {default_val}')
+                        else:
+                            clauses.append(f'ADD COLUMN {col_name} {col_type}')
+                        print(f"  ✅ Adding {col_name}")
+                    if clauses:
+                        # SQLite takes a single ADD COLUMN per ALTER TABLE
+                        statements = clauses if is_sqlite else [', '.join(clauses)]
+                        for statement in statements:
+                            connection.execute(db.text(f'ALTER TABLE {table_name} ' + statement))
+
+                table_columns = get_all_columns(['quiz', 'question'])
 
                 # ========== UPDATE QUIZ TABLE ==========
                 print("📊 Checking 'quiz' table...")
-                columns = get_columns('quiz')
-                
-                if 'overall_timer' not in columns:
-                    connection.execute(db.text('ALTER TABLE quiz ADD COLUMN overall_timer INTEGER'))
-                    print("  ✅ Added overall_timer")
-                else:
-                    print("  - overall_timer exists")
-                
-                if 'show_leaderboard_global' not in columns:
-                    connection.execute(db.text('ALTER TABLE quiz ADD COLUMN show_leaderboard_global BOOLEAN DEFAULT TRUE'))
-                    print("  ✅ Added show_leaderboard_global")
+                columns = table_columns['quiz']
+                add_missing_columns('quiz', columns, [
+                    ('overall_timer', 'INTEGER', None),
+                    ('show_leaderboard_global', 'BOOLEAN', 'TRUE'),
+                    ('content_version', 'INTEGER NOT NULL', '0'),
+                ])
+
+                if is_sqlite:
+                    # SQLite can't add a CHECK to an existing table; fix the data only
+                    connection.execute(db.text(
+                        'UPDATE quiz SET join_code = upper(join_code) WHERE join_code <> upper(join_code)'
+                    ))
+                    print("  - join_code uppercased (CHECK is PostgreSQL only here)")
+                elif not connection.execute(db.text(
+                    "SELECT 1 FROM pg_constraint WHERE conname = 'ck_quiz_join_code_upper'"
+                )).scalar():
+                    connection.execute(db.text(
+                        'UPDATE quiz SET join_code = upper(join_code) WHERE join_code <> upper(join_code)'
+                    ))
+                    connection.execute(db.text(
+                        'ALTER TABLE quiz ADD CONSTRAINT ck_quiz_join_code_upper '
+                        'CHECK (join_code = upper(join_code))'
+                    ))
+                    print("  ✅ Added uppercase join_code check")
                 else:
-                    print("  - show_leaderboard_global exists")
+                    print("  - join_code check exists")
 
                 # ========== UPDATE QUESTION TABLE ==========
                 print("\n📊 Checking 'question' table...")
-                columns = get_columns('question')
+                columns = table_columns['question']
                 
                 # Column definitions (Name, Type, Default Value)
                 # Note: String defaults must use single quotes inside the SQL string
+                json_type = 'JSON' if is_sqlite else 'JSONB'
                 new_columns = [
                     ('question_text_plain', 'TEXT', None),
                     ('question_type', 'VARCHAR(50)', "'multiple-choice'"), # Note the single quotes for string literal
-                    ('options', 'TEXT', None),
-                    ('correct_answers', 'TEXT', None),
+                    ('options', json_type, None),
+                    ('correct_answers', json_type, None),
                     ('points', 'FLOAT', '1.0'),
                     ('show_leaderboard', 'BOOLEAN', 'TRUE'),
                     ('question_image', 'TEXT', None),
                     ('time_limit', 'INTEGER', '0')
                 ]
-                
-                for col_name, col_type, default_val in new_columns:
-                    if col_name not in columns:
-                        # Construct query with/without default
-                        if default_val:
-                            query = f'ALTER TABLE question ADD COLUMN {col_name} {col_type} DEFAULT {default_val}'
+                add_missing_columns('question', columns, new_columns)
+
+                # Older databases store options/correct_answers as JSON text.
+                # Rows that don't parse become NULL instead of aborting the
+                # migration; the legacy-column fold below then refills them
+                if is_sqlite:
+                    # JSON stays text on SQLite, so only the bad rows change
+                    for col_name in ('options', 'correct_answers'):
+                        malformed = connection.execute(db.text(
+                            f"SELECT count(*) FROM question WHERE COALESCE({col_name}, '') <> '' "
+                            f"AND NOT json_valid({col_name})"
+                        )).scalar()
+                        connection.execute(db.text(
+                            f"UPDATE question SET {col_name} = NULL "
+                            f"WHERE {col_name} = '' OR NOT json_valid({col_name})"
+                        ))
+                        if malformed:
+                            print(f"  ⚠️ {malformed} row(s) had malformed {col_name} JSON (set to NULL)")
+                else:
+                    connection.execute(db.text(
+                        "CREATE OR REPLACE FUNCTION pg_temp.try_jsonb(value text) RETURNS jsonb AS $$ "
+                        "BEGIN RETURN NULLIF(value, '')::jsonb; "
+                        "EXCEPTION WHEN others THEN RETURN NULL; END $$ LANGUAGE plpgsql IMMUTABLE"
+                    ))
+                    type_query = (
+                        "SELECT column_name, data_type FROM information_schema.columns "
+                        "WHERE table_name = 'question' AND column_name IN ('options', 'correct_answers')"
+                    )
+                    for col_name, data_type in connection.execute(db.text(type_query)).fetchall():
+                        if data_type != 'jsonb':
+                            malformed = connection.execute(db.text(
+                                f"SELECT count(*) FROM question WHERE COALESCE({col_name}::text, '') <> '' "
+                                f"AND pg_temp.try_jsonb({col_name}::text) IS NULL"
+                            )).scalar()
+                            connection.execute(db.text(
+                                f"ALTER TABLE question ALTER COLUMN {col_name} TYPE JSONB "
+                                f"USING pg_temp.try_jsonb({col_name}::text)"
+                            ))
+                            print(f"  ✅ Converted {col_name} to JSONB")
+                            if malformed:
+                                print(f"  ⚠️ {malformed} row(s) had malformed {col_name} JSON (set to NULL)")
                         else:
-                            query = f'ALTER TABLE question ADD COLUMN {col_name} {col_type}'
-                        
-                        connection.execute(db.text(query))
-                        print(f"  ✅ Added {col_name}")
+                            print(f"  - {col_name} is JSONB")
+
+                # Fold the legacy option1..option4 / answer columns into the
+                # JSON columns, then drop them
+                if 'option1' in columns:
+                    if is_sqlite:
+                        # json_group_array gives '[]' where jsonb_agg gives NULL
+                        connection.execute(db.text(
+                            "UPDATE question SET options = NULLIF(("
+                            "  SELECT json_group_array(json_object('text', o.text, 'image', NULL, 'order', o.ord))"
+                            "  FROM (SELECT option1 AS text, 1 AS ord UNION ALL SELECT option2, 2"
+                            "        UNION ALL SELECT option3, 3 UNION ALL SELECT option4, 4 ORDER BY ord) AS o"
+                            "  WHERE COALESCE(o.text, '') <> ''"
+                            "), '[]') WHERE options IS NULL"
+                        ))
+                        connection.execute(db.text(
+                            "UPDATE question SET correct_answers = json_array(answer) "
+                            "WHERE correct_answers IS NULL AND COALESCE(answer, '') <> ''"
+                        ))
                     else:
-                        print(f"  - {col_name} exists")
+                        connection.execute(db.text(
+                            "UPDATE question SET options = ("
+                            "  SELECT jsonb_agg(jsonb_build_object('text', o.text, 'image', NULL, 'order', o.ord) ORDER BY o.ord)"
+                            "  FROM (VALUES (option1, 1), (option2, 2), (option3, 3), (option4, 4)) AS o(text, ord)"
+                            "  WHERE COALESCE(o.text, '') <> ''"
+                            ") WHERE options IS NULL"
+                        ))
+                        connection.execute(db.text(
+                            "UPDATE question SET correct_answers = jsonb_build_array(answer) "
+                            "WHERE correct_answers IS NULL AND COALESCE(answer, '') <> ''"
+                        ))
+                    # SQLite's DROP COLUMN has no IF EXISTS
+                    for col_name in ('option1', 'option2', 'option3', 'option4', 'answer'):
+                        if col_name in columns:
+                            connection.execute(db.text(f'ALTER TABLE question DROP COLUMN {col_name}'))
+                    print("  ✅ Moved legacy option1..4/answer into options/correct_answers")
+                else:
+                    print("  - legacy option columns already removed")
+
+                # ========== UPDATE PARTIAL_ANSWER TABLE ==========
+                print("\n📊 Checking 'partial_answer' table...")
+                type_query = (
+                    "SELECT data_type FROM information_schema.columns "
+                    "WHERE table_name = 'partial_answer' AND column_name = 'submitted_at'"
+                )
+                if is_sqlite:
+                    print("  - submitted_at needs no conversion on SQLite")
+                elif connection.execute(db.text(type_query)).scalar() == 'timestamp without time zone':
+                    connection.execute(db.text(
+                        "ALTER TABLE partial_answer ALTER COLUMN submitted_at "
+                        "TYPE TIMESTAMPTZ USING submitted_at AT TIME ZONE 'UTC'"
+                    ))
+                    print("  ✅ Converted submitted_at to TIMESTAMPTZ")
+                if not is_sqlite:
+                    connection.execute(db.text(
+                        'ALTER TABLE partial_answer ALTER COLUMN submitted_at SET DEFAULT now()'
+                    ))
+                    print("  ✅ submitted_at defaults to now()")
+
+                # ========== INDEXES ==========
+                print("\n📊 Checking indexes...")
+                index_statements = [
+                    'DROP INDEX IF EXISTS ix_partial_answer_quiz_id',
+                    'DROP INDEX IF EXISTS ix_partial_answer_student',
+                    # Superseded by the _totals / _rank definitions below
+                    'DROP INDEX IF EXISTS ix_partial_answer_quiz_student',
+                    'DROP INDEX IF EXISTS ix_partial_answer_quiz_question_correct',
+                    # Nothing reads results by time alone any more
+                    'DROP INDEX IF EXISTS ix_result_submitted_at',
+                    'CREATE INDEX IF NOT EXISTS ix_partial_answer_quiz_student_totals '
+                    'ON partial_answer (quiz_id, student, question_id)'
+                    # Covering columns for index-only scans (PostgreSQL only)
+                    + ('' if is_sqlite else ' INCLUDE (is_correct, points, time_taken)'),
+                    'CREATE INDEX IF NOT EXISTS ix_partial_answer_quiz_question_rank '
+                    'ON partial_answer (quiz_id, question_id, is_correct DESC, time_taken)',
+                    'CREATE INDEX IF NOT EXISTS ix_question_quiz_order ON question (quiz_id, "order")',
+                    'CREATE INDEX IF NOT EXISTS ix_result_quiz_points ON result (quiz_id, total_points DESC)',
+                    'CREATE INDEX IF NOT EXISTS ix_result_student_submitted ON result (student, submitted_at DESC)',
+                    'CREATE INDEX IF NOT EXISTS ix_partial_answer_submitted_at ON partial_answer (submitted_at)',
+                ]
+                for statement in index_statements:
+                    connection.execute(db.text(statement))
+                print("  ✅ Indexes up to date")
 
                 trans.commit()
                 print(f"\n{'='*50}")
                 print("✅ MIGRATION COMPLETED SUCCESSFULLY!")
                 print("   Please restart your Flask application.")
                 print(f"{'='*50}")
+                return True
 
         except Exception as e:
             print(f"\n❌ MIGRATION FAILED: {e}")
@@ -84,6 +255,8 @@ def migrate_database():
                 trans.rollback()
             except:
                 pass
+            return False
 
 if __name__ == '__main__':
-    migrate_database()
\ No newline at end of file
+    if not migrate_database():
+        sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""
+Test fixtures
+The app runs against a throwaway SQLite file with the per-worker
+(no Redis) fallbacks
+"""
+import os
+import tempfile
+
+import pytest
+
+# Config reads these once, when app.config is first imported
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(prefix='quizx-tests-'), 'test.db')
+os.environ['FLASK_ENV'] = 'development'
+os.environ.pop('REDIS_URL', None)
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    """App with every model's table created, dropped again afterwards"""
+    app = create_app()
+    app.config['TESTING'] = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
@@ -0,0 +1,92 @@
+"""
+migrate_db.py against a pre-JSON question table
+"""
+from app.extensions import db
+from app.models import Question
+from migrate_db import migrate_database
+
+LEGACY_COLUMNS = ('option1', 'option2', 'option3', 'option4', 'answer')
+
+
+def _question_columns():
+    return {row[1] for row in db.session.execute(db.text('PRAGMA table_info(question)'))}
+
+
+def _seed_legacy_questions():
+    """Rebuild question the way old databases have it and add one row per case"""
+    db.session.execute(db.text("INSERT INTO quiz (id, title, join_code) VALUES (1, 'Legacy', 'LEGACY')"))
+    db.session.execute(db.text('DROP TABLE question'))
+    db.session.execute(db.text(
+        'CREATE TABLE question (id INTEGER PRIMARY KEY, quiz_id INTEGER NOT NULL, '
+        '"order" INTEGER, question TEXT NOT NULL, options TEXT, correct_answers TEXT, '
+        'option1 TEXT, option2 TEXT, option3 TEXT, option4 TEXT, answer TEXT)'
+    ))
+    rows = [
+        # Only the legacy columns are filled in
+        (1, None, None, 'a', 'b', '', None, '2'),
+        # Malformed JSON, recoverable from the legacy columns
+        (2, '{not json', '[1', 'x', None, None, None, '1'),
+        # Already migrated: the JSON wins over stale legacy values
+        (3, '[{"text": "k", "image": null, "order": 1}]', '[1]', 'stale', None, None, None, '4'),
+        # Nothing to recover
+        (4, '', '', None, None, None, None, ''),
+    ]
+    for row in rows:
+        db.session.execute(db.text(
+            'INSERT INTO question (id, quiz_id, "order", question, options, correct_answers, '
+            'option1, option2, option3, option4, answer) '
+            'VALUES (:id, :quiz_id, :id, :question, :options, :correct, :o1, :o2, :o3, :o4, :answer)'
+        ), dict(zip(('id', 'options', 'correct', 'o1', 'o2', 'o3', 'o4', 'answer'), row),
+                quiz_id=1, question=f'Q{row[0]}'))
+    db.session.commit()
+    # migrate_database() opens its own connection; don't hold the SQLite lock
+    db.session.remove()
+
+
+def _questions_by_id():
+    return {question.id: question for question in Question.query.all()}
+
+
+def test_folds_legacy_columns_and_drops_them(app):
+    _seed_legacy_questions()
+
+    assert migrate_database() is True
+
+    columns = _question_columns()
+    assert not columns & set(LEGACY_COLUMNS)
+    assert {'question_type', 'points', 'time_limit', 'show_leaderboard'} <= columns
+
+    questions = _questions_by_id()
+    assert questions[1].options == [
+        {'text': 'a', 'image': None, 'order': 1},
+        {'text': 'b', 'image': None, 'order': 2},
+    ]
+    assert questions[1].correct_answers == ['2']
+    assert questions[1].question_type == 'multiple-choice'
+
+
+def test_malformed_json_is_replaced_not_fatal(app):
+    _seed_legacy_questions()
+
+    assert migrate_database() is True
+
+    questions = _questions_by_id()
+    assert questions[2].options == [{'text': 'x', 'image': None, 'order': 1}]
+    assert questions[2].correct_answers == ['1']
+    # Valid JSON is left alone
+    assert questions[3].options == [{'text': 'k', 'image': None, 'order': 1}]
+    assert questions[3].correct_answers == [1]
+    assert questions[4].options is None
+    assert questions[4].correct_answers is None
+
+
+def test_running_twice_changes_nothing(app):
+    _seed_legacy_questions()
+    assert migrate_database() is True
+    before = {qid: (q.options, q.correct_answers) for qid, q in _questions_by_id().items()}
+    db.session.remove()
+
+    assert migrate_database() is True
+
+    after = {qid: (q.options, q.correct_answers) for qid, q in _questions_by_id().items()}
+    assert after == before
@@ -0,0 +1,39 @@
+"""
+PartialAnswer.upsert on SQLite
+"""
+from app.extensions import db
+from app.models import PartialAnswer
+
+
+def _answers():
+    return PartialAnswer.query.order_by(PartialAnswer.id).all()
+
+
+def test_upsert_inserts_a_new_answer(app):
+    PartialAnswer.upsert(1, 10, 'alice', is_correct=True, time_taken=4, points=100)
+    db.session.commit()
+
+    [answer] = _answers()
+    assert (answer.quiz_id, answer.question_id, answer.student) == (1, 10, 'alice')
+    assert (answer.is_correct, answer.time_taken, answer.points) == (True, 4, 100)
+    assert answer.submitted_at is not None
+
+
+def test_upsert_replaces_the_earlier_answer(app):
+    PartialAnswer.upsert(1, 10, 'alice', is_correct=True, time_taken=4, points=100)
+    PartialAnswer.upsert(1, 10, 'alice', is_correct=False, time_taken=9, points=0)
+    db.session.commit()
+
+    [answer] = _answers()
+    assert (answer.is_correct, answer.time_taken, answer.points) == (False, 9, 0)
+
+
+def test_upsert_keeps_other_questions_and_students(app):
+    PartialAnswer.upsert(1, 10, 'alice', is_correct=True, time_taken=4, points=100)
+    PartialAnswer.upsert(1, 11, 'alice', is_correct=True, time_taken=5, points=90)
+    PartialAnswer.upsert(1, 10, 'bob', is_correct=False, time_taken=6, points=0)
+    db.session.commit()
+
+    assert [(a.question_id, a.student) for a in _answers()] == [
+        (10, 'alice'), (11, 'alice'), (10, 'bob')
+    ]
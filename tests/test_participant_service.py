@@ -0,0 +1,64 @@
+"""
+ParticipantService per-worker fallback (no REDIS_URL)
+"""
+import pytest
+
+from app.extensions import (
+    waiting_rooms, active_participants, participant_name_counts, participant_sockets
+)
+from app.services import ParticipantService
+
+QUIZ_ID = 1
+
+
+@pytest.fixture(autouse=True)
+def empty_rooms():
+    caches = (waiting_rooms, active_participants, participant_name_counts, participant_sockets)
+    for cache in caches:
+        cache.clear()
+    yield
+    for cache in caches:
+        cache.clear()
+
+
+def test_join_returns_sorted_waiting_room():
+    ParticipantService.join(QUIZ_ID, 'sid-b', 'bob')
+    assert ParticipantService.join(QUIZ_ID, 'sid-a', 'alice') == ['alice', 'bob']
+    assert ParticipantService.waiting_count(QUIZ_ID) == 2
+    assert ParticipantService.participant_names(QUIZ_ID) == ['alice', 'bob']
+
+
+def test_leave_drops_only_the_leaving_socket():
+    ParticipantService.join(QUIZ_ID, 'sid-1', 'alice')
+    ParticipantService.join(QUIZ_ID, 'sid-2', 'alice')
+
+    assert ParticipantService.leave(QUIZ_ID, 'sid-1', 'alice') is True
+    assert ParticipantService.waiting_users(QUIZ_ID) == []
+    # alice still has a second tab connected
+    assert ParticipantService.participant_names(QUIZ_ID) == ['alice']
+    assert ParticipantService.leave(QUIZ_ID, 'sid-1', 'alice') is False
+
+
+def test_rejoin_under_a_new_name_moves_the_socket():
+    ParticipantService.join(QUIZ_ID, 'sid-1', 'alice')
+    ParticipantService.join(QUIZ_ID, 'sid-1', 'alicia')
+    assert ParticipantService.participant_names(QUIZ_ID) == ['alicia']
+
+
+def test_disconnect():
+    ParticipantService.join(QUIZ_ID, 'sid-1', 'alice')
+
+    assert ParticipantService.disconnect('sid-1') == (QUIZ_ID, 'alice')
+    assert ParticipantService.waiting_users(QUIZ_ID) == []
+    assert ParticipantService.participant_names(QUIZ_ID) == []
+    # Unknown or already-gone sockets
+    assert ParticipantService.disconnect('sid-1') is None
+
+
+def test_disconnect_after_leaving_the_waiting_room():
+    ParticipantService.join(QUIZ_ID, 'sid-1', 'alice')
+    ParticipantService.join(QUIZ_ID, 'sid-2', 'alice')
+    ParticipantService.leave(QUIZ_ID, 'sid-1', 'alice')
+
+    assert ParticipantService.disconnect('sid-2') == (QUIZ_ID, None)
+    assert ParticipantService.participant_names(QUIZ_ID) == []
@@ -0,0 +1,45 @@
+"""
+QuizStateService per-worker fallback (no REDIS_URL)
+"""
+import pytest
+
+from app.extensions import quiz_state
+from app.services import QuizStateService
+
+QUIZ_ID = 1
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    quiz_state.clear()
+    QuizStateService.set(QUIZ_ID, {'current_qindex': 0, 'total_questions': 3})
+    yield
+    quiz_state.clear()
+
+
+def test_advance_within_stops_at_the_last_question():
+    assert QuizStateService.advance_within(QUIZ_ID, 3) == 1
+    assert QuizStateService.advance_within(QUIZ_ID, 3) == 2
+    assert QuizStateService.advance_within(QUIZ_ID, 3) is None
+    assert QuizStateService.get(QUIZ_ID)['current_qindex'] == 2
+
+
+def test_advance_within_keeps_other_fields():
+    QuizStateService.update(QUIZ_ID, started_at=123.0)
+    QuizStateService.advance_within(QUIZ_ID, 3)
+    assert QuizStateService.get(QUIZ_ID) == {
+        'current_qindex': 1, 'total_questions': 3, 'started_at': 123.0
+    }
+
+
+def test_advance_within_without_state_starts_from_zero():
+    QuizStateService.clear(QUIZ_ID)
+    assert QuizStateService.advance_within(QUIZ_ID, 3) == 1
+
+
+def test_step_back_stops_at_the_first_question():
+    QuizStateService.update(QUIZ_ID, current_qindex=2)
+    assert QuizStateService.step_back(QUIZ_ID) == 1
+    assert QuizStateService.step_back(QUIZ_ID) == 0
+    assert QuizStateService.step_back(QUIZ_ID) is None
+    assert QuizStateService.get(QUIZ_ID)['current_qindex'] == 0
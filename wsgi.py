@@ -3,6 +3,9 @@ Production WSGI Entry Point
 Used by gunicorn and other WSGI servers
 """
 import os
+# Running this file directly in eventlet mode: set EVENTLET_MONKEY=1 so
+# importing app patches the stdlib first (gunicorn's eventlet worker
+# patches on its own)
 from app import create_app
 from app.extensions import socketio
 
@@ -11,7 +14,6 @@ app = create_app()
 
 # For development server
 if __name__ == '__main__':
-    # Development mode only
     # In production, use: gunicorn --worker-class eventlet -w 1 wsgi:app
     port = int(os.getenv('PORT', 5000))
     
@@ -19,6 +21,7 @@ if __name__ == '__main__':
         app,
         host='0.0.0.0',
         port=port,
-        debug=True,
+        # Debugger/reloader only when the config asks for it (development)
+        debug=app.debug,
         use_reloader=False  # Fix for Windows + Python 3.13 compatibility
-    )
\ No newline at end of file
+    )